@@ -1,30 +1,37 @@
 import logging
 import asyncio
-from typing import Any, Dict, Optional, List, Tuple, Awaitable, Set
+import hashlib
+import json
+import re
+import unicodedata
+from typing import Any, Callable, Dict, Optional, List, Tuple, Awaitable
 
+from cachetools import TTLCache
 from pydantic import ValidationError
+from typing_extensions import TypeAlias
 
 from services.open_router_service import OpenRouterService
 from services.semantic_search_service import SemanticSearchService
 from services.sql_query_agent_service import SQLQueryAgentService
 from models.schemas import (
     ChatbotUsageLog,
-    DETERMINE_ANSWER_SOURCE_SCHEMA,
+    DETERMINE_ANSWER_SOURCE_SCHEMA_JSON,
     DetermineAnswerSourceResult,
 )
 from models.respons_schemas import SupportChatResponse
 from core.exceptions import ChatbotException
-from models.enum import ChatMode
+from models.enum import MODE_STANDARD, MODE_SUPPORT, ChatMode
 from prompts.chatbot_prompts import (
     build_conversation_title_prompt,
     build_routing_prompt,
+    format_keyword_block,
     build_service_response_prompt,
+    redact_sensitive_identifiers,
 )
 from models.request_schemas import (
     ChatRequest,
     ConversationResponse,
     SupportChatRequest,
-    SupportMetadata,
 )
 
 logger = logging.getLogger(__name__)
@@ -41,7 +48,6 @@ database_keywords = [
     "Risk Analizi",
     "istatistik",
     # database keywords en-US
-    "dfi",
     "incident report",
     "safety report",
     "operational audit report",
@@ -58,9 +64,49 @@ document_keywords = [
     "procedure",
     "general knowledge",
 ]
+# Order-preserving de-duplicated views, with case-folded sets for lookups
+DATABASE_KEYWORDS = tuple(dict.fromkeys(database_keywords))
+DOCUMENT_KEYWORDS = tuple(dict.fromkeys(document_keywords))
+DATABASE_KEYWORDS_SET = frozenset(keyword.lower() for keyword in DATABASE_KEYWORDS)
+DOCUMENT_KEYWORDS_SET = frozenset(keyword.lower() for keyword in DOCUMENT_KEYWORDS)
+
+# Pre-rendered once so the cached routing prefix stays byte-identical
+DATABASE_KEYWORDS_BLOCK = format_keyword_block(DATABASE_KEYWORDS)
+DOCUMENT_KEYWORDS_BLOCK = format_keyword_block(DOCUMENT_KEYWORDS)
+
+
+# Match the routing JSON's "sources" array and "improved_question" string once
+# each is closed in the stream
+_STREAMED_SOURCES_RE = re.compile(r'"sources"\s*:\s*(\[[^\]]*\])')
+_STREAMED_QUESTION_RE = re.compile(r'"improved_question"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+# Single-pass source de-duplication in _prioritize_sources
+_SOURCE_BITS = {"casual": 1, "database": 2, "document": 4}
+_HEAVY_SOURCE_BITS = _SOURCE_BITS["database"] | _SOURCE_BITS["document"]
+
+ServiceTask: TypeAlias = "asyncio.Task[Tuple[str, ChatbotUsageLog]]"
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _normalize_question(question: str) -> str:
+    return unicodedata.normalize("NFKC", question or "").strip().lower()
 
 
 class Chatbot:
+    # The caches live on the class so they are shared by every Chatbot
+    # instance within the worker process.
+    _route_cache: TTLCache = TTLCache(maxsize=4096, ttl=900)
+    _title_cache: TTLCache = TTLCache(maxsize=4096, ttl=900)
+    _cache_lock = asyncio.Lock()
+    # In-flight support pipelines keyed by (account_id, normalized message);
+    # concurrent identical requests await the same task
+    _support_inflight: Dict[Tuple[Optional[int], str], "asyncio.Task[str]"] = {}
+    # (template version, formatted payload) from the SQL agent's shared templates
+    _sql_templates_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+
     def __init__(self):
         """Initialize chatbot with required services."""
         try:
@@ -72,7 +118,7 @@ class Chatbot:
 
             logger.info("Chatbot services initialized successfully")
         except Exception as e:
-            logger.error(f"Error initializing chatbot services: {str(e)}")
+            logger.error("Error initializing chatbot services: %s", e)
 
             raise ChatbotException("Failed to initialize chatbot services")
 
@@ -84,23 +130,37 @@ class Chatbot:
             # Create a short conversation summary for title generation
             conversation_text = self._serialize_context(messages, limit=3)
 
-            prompt = build_conversation_title_prompt(conversation_text)
+            cache_key = _digest(conversation_text)
+            async with self._cache_lock:
+                cached_title = self._title_cache.get(cache_key)
+            if cached_title is not None:
+                return {
+                    "success": True,
+                    "title": cached_title,
+                    "usage_log": ChatbotUsageLog(),
+                }
+
+            messages = build_conversation_title_prompt(conversation_text)
 
             usage_log = ChatbotUsageLog()
 
-            response = self.openrouter_service.generate_text(
-                prompt=prompt,
+            response = await self.openrouter_service.agenerate_text(
+                messages=messages,
                 model="google/gemini-2.5-flash-lite-preview-06-17",
                 temperature=0.3,
                 usage_log=usage_log,
+                cache=True,
             )
 
             result = response.content.strip()
+            if result:
+                async with self._cache_lock:
+                    self._title_cache[cache_key] = result
 
             return {"success": True, "title": result, "usage_log": usage_log}
 
         except Exception as e:
-            logger.error(f"Error generating conversation title: {str(e)}")
+            logger.error("Error generating conversation title: %s", e)
             return {
                 "success": False,
                 "title": "Conversation Title",
@@ -113,40 +173,102 @@ class Chatbot:
         context: List[ConversationResponse],
         site_map: Optional[str],
         mode: ChatMode = ChatMode.STANDARD,
+        on_route: Optional[Callable[[List[str], str], None]] = None,
+        history: Optional[str] = None,
     ) -> tuple[List[str], str, ChatbotUsageLog, Optional[str]]:
-        """Determine best answer route and optionally provide immediate casual response."""
+        """
+        Determine best answer route and optionally provide immediate casual response.
+
+        When `on_route` is given the routing response is streamed and the
+        callback receives the sources and the improved question as soon as both
+        are complete, before the casual reply has been decoded.
+        `history` is the already serialized recent context, when the caller has it.
+        """
         try:
             usage_log = ChatbotUsageLog()
             immediate_response: Optional[str] = None
 
-            sanitized_history = self._serialize_context(context, limit=5)
-            prompt = build_routing_prompt(
+            sanitized_history = (
+                history
+                if history is not None
+                else self._serialize_context(context, limit=5)
+            )
+            mode_value = mode.value if mode else MODE_STANDARD
+
+            # The casual reply may draw on the history, so it is part of the key
+            cache_key = (
+                _normalize_question(question),
+                mode_value,
+                _digest(site_map or ""),
+                _digest(sanitized_history),
+            )
+            async with self._cache_lock:
+                cached_route = self._route_cache.get(cache_key)
+            if cached_route is not None:
+                cached_sources, cached_question, cached_response = cached_route
+                return (
+                    list(cached_sources),
+                    cached_question,
+                    usage_log,
+                    cached_response,
+                )
+
+            messages = build_routing_prompt(
                 question=question,
                 conversation_history=sanitized_history,
-                database_keywords=database_keywords,
-                document_keywords=document_keywords,
-                conversation_mode=mode.value if mode else ChatMode.STANDARD.value,
+                database_keywords_block=DATABASE_KEYWORDS_BLOCK,
+                document_keywords_block=DOCUMENT_KEYWORDS_BLOCK,
+                conversation_mode=mode_value,
                 site_map=site_map or "",
             )
 
-            response = self.openrouter_service.generate_text(
-                prompt=prompt,
+            on_delta: Optional[Callable[[str], None]] = None
+            if on_route is not None:
+                announced = False
+
+                def on_delta(partial: str) -> None:
+                    nonlocal announced
+                    if announced:
+                        return
+                    sources_match = _STREAMED_SOURCES_RE.search(partial)
+                    question_match = _STREAMED_QUESTION_RE.search(partial)
+                    if not sources_match or not question_match:
+                        return
+                    announced = True
+                    try:
+                        streamed_sources = json.loads(sources_match.group(1))
+                        streamed_question = json.loads(question_match.group(1))
+                    except ValueError:
+                        return
+                    if isinstance(streamed_sources, list) and isinstance(
+                        streamed_question, str
+                    ):
+                        on_route(
+                            [str(src) for src in streamed_sources],
+                            streamed_question.strip() or question,
+                        )
+
+            response = await self.openrouter_service.agenerate_text(
+                messages=messages,
                 model="meta-llama/llama-4-scout",
                 temperature=0.1,
                 usage_log=usage_log,
-                response_format=DETERMINE_ANSWER_SOURCE_SCHEMA,
+                response_format=DETERMINE_ANSWER_SOURCE_SCHEMA_JSON,
+                cache=True,
+                on_delta=on_delta,
             )
 
             sources = ["casual"]
             improved_question = question
 
             casual_answer: Optional[str] = None
+            parsed = False
             try:
                 parsed_response = DetermineAnswerSourceResult.model_validate_json(
                     response.content.strip()
                 )
-                normalized_sources = parsed_response.prioritized_sources()
-                if mode == ChatMode.SUPPORT and "casual" in (normalized_sources or []):
+                normalized_sources = list(parsed_response.prioritized_sources)
+                if mode == MODE_SUPPORT and "casual" in (normalized_sources or []):
                     normalized_sources = ["casual"]
                 if normalized_sources:
                     sources = normalized_sources
@@ -158,6 +280,7 @@ class Chatbot:
                 text_response = (parsed_response.casual_response or "").strip()
                 if text_response:
                     casual_answer = text_response
+                parsed = True
 
             except (ValidationError, ValueError) as parse_error:
                 logger.warning(
@@ -173,10 +296,19 @@ class Chatbot:
                     "Şu anda isteğinizi yerine getiremedim. Lütfen tekrar dener misiniz?"
                 )
 
+            # Only cache routes the model actually decided, not parse fallbacks
+            if parsed:
+                async with self._cache_lock:
+                    self._route_cache[cache_key] = (
+                        list(sources),
+                        improved_question,
+                        immediate_response,
+                    )
+
             return sources, improved_question, usage_log, immediate_response
 
         except Exception as e:
-            logger.error(f"Error determining answer source: {str(e)}")
+            logger.error("Error determining answer source: %s", e)
             # Default to document search on error, return as list
             return (
                 ["document"],
@@ -191,7 +323,7 @@ class Chatbot:
         """Utility to merge model usage entries."""
         if not target or not source:
             return
-        for usage in source.model_usages:
+        for usage in source.iter_usages():
             target.add_usage(
                 model=usage.model,
                 prompt_tokens=usage.prompt_tokens,
@@ -203,6 +335,12 @@ class Chatbot:
 
     def _format_sql_templates(self) -> Dict[str, Any]:
         templates = getattr(self.sql_query_agent_service, "chatbot_sql_templates", [])
+        version = getattr(
+            self.sql_query_agent_service, "chatbot_sql_templates_version", None
+        )
+        cached = Chatbot._sql_templates_cache
+        if version and cached is not None and cached[0] == version:
+            return cached[1]
         if not templates:
             return {"text": "", "list": []}
 
@@ -221,20 +359,80 @@ class Chatbot:
                     "description": description,
                 }
             )
-        return {
+        payload = {
             "text": "\n\n".join(lines),
             "list": serialized,
         }
+        if version:
+            Chatbot._sql_templates_cache = (version, payload)
+        return payload
 
     @staticmethod
-    def _serialize_context(
+    def _context_lines(
         context: Optional[List[ConversationResponse]], limit: Optional[int] = None
-    ) -> str:
-        """Convert a list of conversation entries to a printable string."""
+    ) -> List[str]:
+        """Render conversation entries as `role: content` lines."""
         if not context:
-            return ""
+            return []
         selected = context[-limit:] if limit else context
-        return "\n".join(f"{msg.role}: {msg.content}" for msg in selected if msg)
+        return [f"{msg.role}: {msg.content}" for msg in selected if msg]
+
+    @classmethod
+    def _serialize_context(
+        cls, context: Optional[List[ConversationResponse]], limit: Optional[int] = None
+    ) -> str:
+        """Convert a list of conversation entries to a printable string."""
+        return "\n".join(cls._context_lines(context, limit))
+
+    @staticmethod
+    def _prioritize_sources(answer_sources: Optional[List[str]]) -> List[str]:
+        """Normalize and de-duplicate sources, keeping only the first heavy service."""
+        prioritized_sources: List[str] = []
+        seen = 0
+        for source in answer_sources or ("casual",):
+            normalized = (source or "casual").strip().lower()
+            bit = _SOURCE_BITS.get(normalized, 0)
+            if not bit or seen & bit:
+                continue
+            # Limit heavy services (SQL/document) to the first prioritized source
+            if bit & _HEAVY_SOURCE_BITS and seen & _HEAVY_SOURCE_BITS:
+                continue
+            seen |= bit
+            prioritized_sources.append(normalized)
+
+        return prioritized_sources or ["casual"]
+
+    def _start_prefetch(
+        self, source: str, question: str, account_id: int
+    ) -> ServiceTask:
+        """Start a heavy service call in the background for later hand-over."""
+        if source == "database":
+            coro = self.sql_query_agent_service.advanced_database_chat(
+                question=question, account_id=account_id
+            )
+        else:
+            coro = self.semantic_search_service.advanced_document_chat(
+                question=question, account_id=account_id
+            )
+        task = asyncio.create_task(coro)
+        # Retrieve the outcome of tasks that end up unused so failures are not
+        # reported as "never retrieved" when they are discarded
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    async def _drain_prefetches(
+        self, prefetched: Dict[str, ServiceTask], usage_log: ChatbotUsageLog
+    ) -> None:
+        """Wait for speculative calls that were not handed over and record their usage."""
+        if not prefetched:
+            return
+        tasks = list(prefetched.values())
+        prefetched.clear()
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                continue
+            self._update_usage_log(usage_log, outcome[1])
 
     async def _execute_answer_sources(
         self,
@@ -242,38 +440,25 @@ class Chatbot:
         question: str,
         context: List[ConversationResponse],
         account_id: int,
+        prefetched: Optional[Dict[str, ServiceTask]] = None,
+        history: Optional[str] = None,
     ) -> Tuple[str, str, ChatbotUsageLog, List[str], Dict[str, Any]]:
-        """Execute the necessary services based on determined sources."""
-        deduped_sources: List[str] = []
-        seen_sources: Set[str] = set()
-        for source in answer_sources or ["casual"]:
-            normalized = (source or "casual").strip().lower()
-            if normalized not in {"database", "document", "casual"}:
-                continue
-            if normalized in seen_sources:
-                continue
-            deduped_sources.append(normalized)
-            seen_sources.add(normalized)
+        """
+        Execute the necessary services based on determined sources.
 
-        context = context or []
+        `prefetched` lets the caller hand over service calls (keyed by source
+        name) that were started speculatively while the route was being planned;
+        the calls used here are popped, so whatever is left was not needed.
+        `history` is the already serialized full context, when the caller has it.
+        """
+        deduped_sources = self._prioritize_sources(answer_sources)
+        prefetched = prefetched if prefetched is not None else {}
 
-        # Limit heavy services (SQL/document) to the first prioritized source
-        heavy_seen = False
-        prioritized_sources: List[str] = []
-        for source in deduped_sources:
-            if source in {"database", "document"}:
-                if heavy_seen:
-                    continue
-                heavy_seen = True
-            prioritized_sources.append(source)
-        deduped_sources = prioritized_sources
+        context = context or []
 
         if not account_id:
             raise ChatbotException("Structured sources require a valid account_id.")
 
-        if not deduped_sources:
-            deduped_sources = ["casual"]
-
         logger.debug(
             "Active answer sources resolved to %s for account_id=%s",
             deduped_sources,
@@ -289,7 +474,8 @@ class Chatbot:
             async_calls.append(
                 (
                     "database",
-                    self.sql_query_agent_service.advanced_database_chat(
+                    prefetched.pop("database", None)
+                    or self.sql_query_agent_service.advanced_database_chat(
                         question=question, account_id=account_id
                     ),
                 )
@@ -298,22 +484,43 @@ class Chatbot:
             async_calls.append(
                 (
                     "document",
-                    self.semantic_search_service.advanced_document_chat(
+                    prefetched.pop("document", None)
+                    or self.semantic_search_service.advanced_document_chat(
                         question=question, account_id=account_id
                     ),
                 )
             )
 
-        gathered = await asyncio.gather(*[coro for _, coro in async_calls])
+        # Prepare the post-processing inputs before awaiting the services
+        if history is None:
+            history = self._serialize_context(context)
+
+        gathered: List[Any] = []
+        if async_calls:
+            # A failing service must not discard the result of the other one
+            gathered = await asyncio.gather(
+                *[coro for _, coro in async_calls], return_exceptions=True
+            )
         section_texts: Dict[str, str] = {}
         active_sources: List[str] = []
+        failures: List[BaseException] = []
 
         for (name, _), outcome in zip(async_calls, gathered):
+            if isinstance(outcome, BaseException):
+                logger.error("Answer source %s failed: %s", name, outcome)
+                self._update_usage_log(
+                    combined_usage, ChatbotUsageLog.create_error_log(str(outcome))
+                )
+                failures.append(outcome)
+                continue
             content, usage = outcome
             self._update_usage_log(combined_usage, usage)
             active_sources.append(name)
             section_texts[name] = (content or "").strip()
 
+        if failures and not active_sources:
+            raise failures[0]
+
         label_map = {
             "database": "Database Result",
             "document": "Document Result",
@@ -339,7 +546,6 @@ class Chatbot:
 
         processed_result = result
         try:
-            history = self._serialize_context(context)
             prompt = build_service_response_prompt(
                 question=question,
                 source_types=active_sources,
@@ -347,16 +553,16 @@ class Chatbot:
                 conversation_history=history,
             )
             processing_usage = ChatbotUsageLog()
-            response = self.openrouter_service.generate_text(
+            response = await self.openrouter_service.agenerate_text(
                 prompt=prompt,
                 model="meta-llama/llama-4-scout",
                 temperature=0.7,
                 usage_log=processing_usage,
             )
-            processed_result = response.content.strip()
+            processed_result = redact_sensitive_identifiers(response.content.strip())
             self._update_usage_log(combined_usage, processing_usage)
         except Exception as e:
-            logger.error(f"Error processing service result: {str(e)}")
+            logger.error("Error processing service result: %s", e)
             self._update_usage_log(
                 combined_usage, ChatbotUsageLog.create_error_log(str(e))
             )
@@ -377,6 +583,29 @@ class Chatbot:
         context = context or []
         site_map = site_map or ""
 
+        # Render the context once; routing only needs the last five entries
+        history_lines = self._context_lines(context)
+        full_history = "\n".join(history_lines)
+        recent_history = "\n".join(history_lines[-5:])
+
+        # Start the routed service as soon as the streamed route names it and
+        # the improved question is known, so the call matches the one routing
+        # asks for. Tasks are handed over if routing keeps them; the usage of
+        # any others is still recorded before returning.
+        prefetched: Dict[str, ServiceTask] = {}
+        prefetched_question: Optional[str] = None
+        on_route: Optional[Callable[[List[str], str], None]] = None
+        if mode == MODE_STANDARD and account_id:
+
+            def on_route(streamed_sources: List[str], streamed_question: str) -> None:
+                nonlocal prefetched_question
+                prefetched_question = streamed_question
+                for source in self._prioritize_sources(streamed_sources):
+                    if source in {"database", "document"} and source not in prefetched:
+                        prefetched[source] = self._start_prefetch(
+                            source, streamed_question, account_id
+                        )
+
         try:
             aggregated_usage = ChatbotUsageLog()
 
@@ -386,10 +615,18 @@ class Chatbot:
                 refined_question,
                 source_usage,
                 immediate_response,
-            ) = await self.plan_answer_route(message, context, site_map, mode=mode)
+            ) = await self.plan_answer_route(
+                message,
+                context,
+                site_map,
+                mode=mode,
+                on_route=on_route,
+                history=recent_history,
+            )
             self._update_usage_log(aggregated_usage, source_usage)
 
             if immediate_response is not None:
+                await self._drain_prefetches(prefetched, aggregated_usage)
                 return {
                     "answer": immediate_response,
                     "raw_result": immediate_response,
@@ -401,12 +638,21 @@ class Chatbot:
 
             active_question = refined_question
 
+            # Only reuse speculative calls started for the final question
+            reusable = prefetched if active_question == prefetched_question else {}
+
             processed_result, raw_result, service_usage, active_sources, extras = (
                 await self._execute_answer_sources(
-                    answer_sources, active_question, context, account_id
+                    answer_sources,
+                    active_question,
+                    context,
+                    account_id,
+                    prefetched=reusable,
+                    history=full_history,
                 )
             )
             self._update_usage_log(aggregated_usage, service_usage)
+            await self._drain_prefetches(prefetched, aggregated_usage)
 
             return {
                 "answer": processed_result,
@@ -419,8 +665,9 @@ class Chatbot:
         except Exception as exc:
             if raise_on_error:
                 raise
-            logger.warning(f"Chat pipeline fallback: {exc}")
+            logger.warning("Chat pipeline fallback: %s", exc)
             usage_log = ChatbotUsageLog.create_error_log(str(exc))
+            await self._drain_prefetches(prefetched, usage_log)
             return {
                 "answer": "",
                 "raw_result": "",
@@ -429,6 +676,52 @@ class Chatbot:
                 "improved_question": message,
                 "extras": {},
             }
+        finally:
+            for task in prefetched.values():
+                if not task.done():
+                    task.cancel()
+
+    async def _run_support_pipeline(
+        self, message: str, account_id: Optional[int]
+    ) -> str:
+        """
+        Support chats carry no context or site map and are routed to a casual
+        reply in almost every case, so route directly and only fall back to the
+        structured services when routing explicitly asks for them.
+        """
+        try:
+            (
+                answer_sources,
+                refined_question,
+                _,
+                immediate_response,
+            ) = await self.plan_answer_route(message, [], "", mode=ChatMode.SUPPORT)
+
+            if immediate_response is not None:
+                return immediate_response
+
+            processed_result, *_ = await self._execute_answer_sources(
+                answer_sources, refined_question, [], account_id, history=""
+            )
+            return processed_result
+        except Exception as exc:
+            logger.warning("Support pipeline fallback: %s", exc)
+            return ""
+
+    async def _run_support_pipeline_shared(
+        self, message: str, account_id: Optional[int]
+    ) -> str:
+        """Collapse concurrent identical support requests into one pipeline run."""
+        key = (account_id, _normalize_question(message))
+        task = self._support_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._run_support_pipeline(message, account_id)
+            )
+            self._support_inflight[key] = task
+            task.add_done_callback(lambda _: self._support_inflight.pop(key, None))
+        # A disconnecting client must not cancel the run the others wait on
+        return await asyncio.shield(task)
 
     async def interact_with_agent(self, request: ChatRequest):
         """Process user message and generate AI response using relevant services."""
@@ -439,7 +732,7 @@ class Chatbot:
                 account_id=request.account_id,
                 site_map=request.siteMap,
                 mode=request.mode,
-                raise_on_error=request.mode != ChatMode.SUPPORT,
+                raise_on_error=request.mode != MODE_SUPPORT,
             )
 
             response_payload = {
@@ -454,7 +747,7 @@ class Chatbot:
             return response_payload
 
         except Exception as e:
-            logger.error(f"Error in interact_with_agent: {str(e)}")
+            logger.error("Error in interact_with_agent: %s", e)
             return {
                 "success": False,
                 "response": "I encountered an error processing your request. Please try again.",
@@ -470,29 +763,19 @@ class Chatbot:
         Returns response with confidence score and escalation recommendation
         """
         try:
-            message = request.message
-
-            chat_request = ChatRequest(
-                content=message,
-                context=[],
-                account_id=request.account_id,
-                siteMap="",
-                mode=ChatMode.SUPPORT,
-                supportMetadata=SupportMetadata(
-                    user_id=request.user_id,
-                    account_id=request.account_id,
-                ),
-            )
-
-            agent_response = await self.interact_with_agent(chat_request)
+            base_response = (
+                await self._run_support_pipeline_shared(
+                    request.message, request.account_id
+                )
+            ).strip()
 
-            logger.info(f"Agent response: {agent_response}")
-            base_response = agent_response.get("response", "").strip()
+            logger.info("Support response: %s", base_response)
             if not base_response:
                 logger.warning("Empty support response, escalating to human support")
                 return self._build_support_error_response()
 
-            return SupportChatResponse(
+            # Every field is set from trusted values, so skip re-validation
+            return SupportChatResponse.model_construct(
                 response=base_response,
                 confidence=0.7,
                 needsHumanSupport=False,
@@ -501,13 +784,13 @@ class Chatbot:
             )
 
         except Exception as e:
-            logger.error(f"Error in handle_support_chat: {str(e)}")
+            logger.error("Error in handle_support_chat: %s", e)
             return self._build_support_error_response()
 
     @staticmethod
     def _build_support_error_response() -> SupportChatResponse:
         """Return a consistent fallback response when support handling fails."""
-        return SupportChatResponse(
+        return SupportChatResponse.model_construct(
             response="Üzgünüm, bir hata oluştu. Lütfen canlı destek talep edin.",
             confidence=0.0,
             needsHumanSupport=True,
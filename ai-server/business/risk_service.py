@@ -1,7 +1,9 @@
-import json
 import logging
+import re
 from typing import Dict, List, Optional
 
+import orjson
+
 from core.exceptions import ChatbotException
 from models.schemas import ChatbotUsageLog
 from models.request_schemas import RiskAssessmentQuestionGenerationRequest
@@ -10,16 +12,19 @@ from services.open_router_service import OpenRouterService
 
 logger = logging.getLogger(__name__)
 
+# Extracts the body of an optionally ```json fenced model reply in one pass
+_FENCE_RE = re.compile(r"^\s*(?:```(?:json)?\s*)?(.*?)(?:\s*```)?\s*$", re.DOTALL)
+
 
 class RiskService:
     def __init__(self):
         """Initialize risk analysis service dependencies."""
         try:
-            self.prompts = RiskAssessmentPrompts()
+            self.prompts = RiskAssessmentPrompts
             self.llm_service = OpenRouterService()
             logger.info("Risk service initialized successfully")
         except Exception as exc:
-            logger.error(f"Error initializing risk service: {exc}")
+            logger.error("Error initializing risk service: %s", exc)
             raise ChatbotException("Failed to initialize risk service") from exc
 
     async def generate_ai_help_analysis(
@@ -43,22 +48,29 @@ class RiskService:
                 language=language,
                 question_id=question_id,
             )
-            prompt = prompt_payload["prompt"]
+            # The instructions only vary by method/language; send them as a
+            # cacheable system message and the question specifics as the user turn
+            system_prompt = prompt_payload["system_prompt"]
+            user_prompt = prompt_payload["user_prompt"]
             image_urls = prompt_payload.get("image_urls") or []
 
             if image_urls:
                 # Send prompt + actual images per https://openrouter.ai/docs/features/multimodal/images
-                response = self.llm_service.multimodal_completion(
-                    text=prompt,
+                response = await self.llm_service.amultimodal_completion(
+                    text=user_prompt,
                     image_urls=image_urls,
+                    system_message=system_prompt,
                     usage_log=usage_log,
                     response_format={"type": "json_object"},
+                    cache=True,
                 )
             else:
-                response = self.llm_service.generate_text(
-                    prompt,
+                response = await self.llm_service.agenerate_text(
+                    user_prompt,
+                    system_message=system_prompt,
                     usage_log=usage_log,
                     response_format={"type": "json_object"},
+                    cache=True,
                 )
 
             if hasattr(response, "content"):
@@ -66,16 +78,10 @@ class RiskService:
             else:
                 response_text = str(response)
 
-            response_text = (
-                response_text.strip()
-                .removeprefix("```json")
-                .removeprefix("```")
-                .removesuffix("```")
-                .strip()
-            )
+            response_text = _FENCE_RE.match(response_text).group(1)
 
             try:
-                parsed_response = json.loads(response_text)
+                parsed_response = orjson.loads(response_text)
                 if isinstance(parsed_response, list) and len(parsed_response) > 0:
                     parsed_response = parsed_response[0]
 
@@ -85,15 +91,15 @@ class RiskService:
                     "data": parsed_response,
                     "usage_log": usage_log,
                 }
-            except json.JSONDecodeError as exc:
-                logger.error(f"JSON parse error: {exc}, Response: {response_text}")
+            except orjson.JSONDecodeError as exc:
+                logger.error("JSON parse error: %s, Response: %s", exc, response_text)
                 return {
                     "success": False,
                     "message": f"Failed to parse AI response: {exc}",
                     "data": None,
                 }
         except Exception as exc:
-            logger.error(f"Error generating AI help analysis: {exc}")
+            logger.error("Error generating AI help analysis: %s", exc)
             return {"success": False, "message": str(exc), "data": None}
 
     async def generate_risk_assessment_question(
@@ -105,7 +111,7 @@ class RiskService:
             prompt = self.prompts.generate_risk_assessment_questions(
                 request.title, request.description
             )
-            response = self.llm_service.generate_text(
+            response = await self.llm_service.agenerate_text(
                 prompt,
                 usage_log=usage_log,
             )
@@ -121,5 +127,5 @@ class RiskService:
                 "data": response_text,
             }
         except Exception as exc:
-            logger.error(f"Error generating risk assessment question: {exc}")
+            logger.error("Error generating risk assessment question: %s", exc)
             raise
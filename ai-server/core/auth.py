@@ -2,20 +2,73 @@
 JWT Authentication for AI Server
 """
 
+import hashlib
 import jwt
 import os
+import threading
+import time
+from cachetools import LRUCache
 from fastapi import HTTPException, Request, status
 from typing import Optional
 
+from utils.helper import get_env
 
-def get_jwt_secret() -> str:
-    """Get JWT secret from environment variable"""
+# Tokens are issued with a single algorithm; accepting several on the same
+# secret invites algorithm confusion.
+JWT_ALG = get_env("JWT_ALG", "HS256")
+
+# Verified payloads keyed by a token digest, so a client's token is only
+# HMAC-checked once per worker; expiry is re-checked on every hit.
+_TOKEN_CACHE: LRUCache = LRUCache(maxsize=8192)
+_TOKEN_CACHE_LOCK = threading.Lock()
+
+
+def _load_jwt_secret() -> str:
+    """Read JWT secret from environment variable"""
     secret = os.getenv("JWT_SECRET")
     if not secret:
         raise ValueError("JWT_SECRET environment variable is not set")
     return secret
 
 
+# Read once at import so a missing secret fails at startup instead of per request
+_JWT_SECRET = _load_jwt_secret()
+
+
+def get_jwt_secret() -> str:
+    """Get JWT secret loaded from the environment at import"""
+    return _JWT_SECRET
+
+
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+
+def _verify_token(token: str) -> dict:
+    """Return the verified payload, from the cache when the token was seen before"""
+    key = _token_cache_key(token)
+    with _TOKEN_CACHE_LOCK:
+        cached = _TOKEN_CACHE.get(key)
+
+    if cached is not None:
+        exp = cached["exp"]
+        if exp > time.time():
+            return dict(cached)
+        with _TOKEN_CACHE_LOCK:
+            _TOKEN_CACHE.pop(key, None)
+        raise jwt.ExpiredSignatureError("Signature has expired")
+
+    payload = jwt.decode(
+        token,
+        _JWT_SECRET,
+        algorithms=[JWT_ALG],
+        options={"verify_signature": True, "require": ["exp"]},
+    )
+    with _TOKEN_CACHE_LOCK:
+        _TOKEN_CACHE[key] = payload
+    return dict(payload)
+
+
 def decode_token(token: str) -> dict:
     """
     Decode and validate JWT token
@@ -30,15 +83,7 @@ def decode_token(token: str) -> dict:
         HTTPException: If token is invalid or expired
     """
     try:
-        secret = get_jwt_secret()
-        # Decode token without verification first to check algorithm
-        payload = jwt.decode(
-            token,
-            secret,
-            algorithms=["HS256", "HS512"],  # Support both algorithms
-            options={"verify_signature": True},
-        )
-        return payload
+        return _verify_token(token)
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,12 +1,17 @@
+import asyncio
 import os
 import logging
 from typing import Optional
 
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_scoped_session,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import scoped_session, sessionmaker
-from sqlalchemy.orm.scoping import ScopedSession
 from sqlalchemy.exc import SQLAlchemyError
 
 from dotenv import load_dotenv
@@ -15,8 +20,6 @@ from utils.helper import get_env
 # Load environment variables from .env file
 load_dotenv()
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Create a base class for declarative models
@@ -31,46 +34,85 @@ def get_database_uri() -> Optional[str]:
     return url
 
 
-def create_database_engine(url: str) -> Engine:
-    """Create and return the SQLAlchemy engine."""
+def get_async_database_uri() -> Optional[str]:
+    """Returns the database URI with the asyncpg driver for the async engine."""
+    url = get_database_uri()
+    if not url:
+        return url
+    for prefix in ("postgresql+psycopg2://", "postgresql://"):
+        if url.startswith(prefix):
+            return url.replace(prefix, "postgresql+asyncpg://", 1)
+    return url
+
+
+def create_database_engine(url: str) -> AsyncEngine:
+    """Create and return the async SQLAlchemy engine."""
     try:
-        return create_engine(url)
+        return create_async_engine(
+            url,
+            pool_size=32,
+            max_overflow=64,
+            pool_pre_ping=True,
+            pool_recycle=1800,
+        )
     except SQLAlchemyError as exc:
         logger.error("Failed to create database engine: %s", exc)
         raise
 
 
-def create_database_session(engine: Engine) -> ScopedSession:
-    """Creates and returns a database session bound to the provided engine."""
+def create_database_session(engine: AsyncEngine) -> async_scoped_session[AsyncSession]:
+    """
+    Creates and returns an async session registry bound to the provided engine.
+    Sessions are scoped to the current asyncio task, so concurrent requests never
+    share one; callers (or DBSessionMiddleware) release it with `remove()`.
+    """
     try:
-        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-        return scoped_session(session_factory)
+        session_factory = async_sessionmaker(
+            bind=engine, autoflush=False, expire_on_commit=False
+        )
+        return async_scoped_session(session_factory, scopefunc=asyncio.current_task)
     except SQLAlchemyError as exc:
         logger.error("Failed to create database session: %s", exc)
         raise
 
 
-def initialize_database(session: Optional[ScopedSession] = None) -> None:
-    """Initializes the database using the provided session or the global engine."""
+async def initialize_database(engine: Optional[AsyncEngine] = None) -> None:
+    """Initializes the database using the provided engine or the global engine."""
     env = get_env("NODE_ENV")
     try:
         if env != "production":
-            bind = session.get_bind() if session is not None else database_engine
-            Base.metadata.create_all(bind=bind)
+            async with (engine or database_engine).begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
     except SQLAlchemyError as exc:
         logger.error("Failed to initialize database: %s", exc)
 
 
+async def warm_up_pool(engine: Optional[AsyncEngine] = None, connections: int = 4) -> None:
+    """Opens a few pooled connections concurrently so early requests skip connection setup."""
+    engine = engine or database_engine
+
+    async def _ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    results = await asyncio.gather(
+        *(_ping() for _ in range(connections)), return_exceptions=True
+    )
+    failures = [result for result in results if isinstance(result, Exception)]
+    if failures:
+        logger.warning("Database pool warm-up failed: %s", failures[0])
+
+
 # Get the database URL from environment variables
-database_url = get_database_uri()
+database_url = get_async_database_uri()
 
 # Check if the database_url is not None or empty
 if not database_url:
     raise ValueError("No 'POSTGRES_URI' set in .env file")
 
-# Create a database engine and session
-database_engine: Engine = create_database_engine(database_url)
-db_session: ScopedSession = create_database_session(database_engine)
-
-# Initialize the database
-initialize_database(db_session)
+# Create a database engine and task-scoped session; the schema is initialized
+# from the application startup hook (see main.py)
+database_engine: AsyncEngine = create_database_engine(database_url)
+db_session: async_scoped_session[AsyncSession] = create_database_session(
+    database_engine
+)
@@ -0,0 +1,24 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from core.database import db_session
+
+
+class DBSessionMiddleware:
+    """
+    Releases the task-scoped database session once a request is finished.
+
+    Implemented as plain ASGI middleware (not BaseHTTPMiddleware) so it runs in
+    the same asyncio task as the endpoint and removes that task's session.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await db_session.remove()
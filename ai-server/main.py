@@ -1,57 +1,188 @@
-from core.database import initialize_database, db_session
-from fastapi import FastAPI, Response
+import asyncio
+import logging
+import queue
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener
+
+from core.database import database_engine, initialize_database, warm_up_pool
+from core.middleware import DBSessionMiddleware
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from routes.main import router
-import psutil
+from services.open_router_service import OpenRouterService
+from utils.helper import format_utc_timestamp
 import os
-from datetime import datetime
 import time
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def configure_logging() -> QueueListener:
+    """
+    Configure logging once at the entry point. The real handlers run on a
+    listener thread; callers on the event loop only enqueue the record and
+    never block on stream I/O. The caller stops the returned listener.
+    """
+    logging.basicConfig(level=logging.INFO)
+    root_logger = logging.getLogger()
+    listener = QueueListener(
+        queue.SimpleQueue(), *root_logger.handlers, respect_handler_level=True
+    )
+    root_logger.handlers = [QueueHandler(listener.queue)]
+    listener.start()
+    return listener
 
 # Track service start time
 SERVICE_START_TIME = time.time()
 
-initialize_database(db_session)
+# psutil is only needed by /health, so its C extension is loaded on first use
+# rather than at worker start-up
+_psutil = None
+
+
+def _get_psutil():
+    global _psutil
+    if _psutil is None:
+        import psutil as _psutil
+
+        # Prime the CPU counters so later interval=None calls return the usage
+        # since the previous call instead of blocking to sample
+        _psutil.cpu_percent(interval=None)
+    return _psutil
+
+
+@dataclass(frozen=True)
+class SystemSnapshot:
+    """Latest system metrics sample; replaced as a whole so readers never see a torn pair."""
+
+    memory: Any
+    cpu_percent: float
+    sampled_at: float
+
+
+# System metrics are refreshed by a background task at a fixed rate,
+# independent of how often /health is polled
+SYSTEM_SAMPLE_INTERVAL = float(os.getenv("SYSTEM_SAMPLE_INTERVAL", "2"))
+_system_snapshot: Optional[SystemSnapshot] = None
+
+
+def _sample_system() -> SystemSnapshot:
+    psutil = _get_psutil()
+    return SystemSnapshot(
+        memory=psutil.virtual_memory(),
+        cpu_percent=psutil.cpu_percent(interval=None),
+        sampled_at=time.monotonic(),
+    )
+
+
+async def _system_sampler() -> None:
+    global _system_snapshot
+    # Load psutil off the event loop so start-up is not delayed by the import
+    await asyncio.to_thread(_get_psutil)
+    while True:
+        try:
+            _system_snapshot = _sample_system()
+        except Exception:
+            logger.exception("System metrics sampling failed")
+        await asyncio.sleep(SYSTEM_SAMPLE_INTERVAL)
+
+
+# The OS name never changes at runtime
+_PLATFORM = os.uname().sysname if hasattr(os, "uname") else "unknown"
+
+# Health payloads are reused for a short TTL so frequent pollers do not
+# re-sample system metrics on every hit
+_HEALTH_TTL = float(os.getenv("HEALTH_CACHE_TTL", "5"))
+_HEALTH_CACHE: Dict[str, Any] = {"payload": None, "status_code": 200, "expires": 0.0}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    log_listener = configure_logging()
+    await initialize_database()
+    await warm_up_pool(connections=int(os.getenv("DB_POOL_WARMUP", "4")))
+    sampler = asyncio.create_task(_system_sampler())
+    yield
+    sampler.cancel()
+    with suppress(asyncio.CancelledError):
+        await sampler
+    await database_engine.dispose()
+    await OpenRouterService.aclose()
+    log_listener.stop()
+
 
 app = FastAPI(
     title="Risksoft AI Server",
     description="AI-powered features for Risksoft platform",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+app.add_middleware(DBSessionMiddleware)
 app.include_router(router)
 
 
-@app.get("/health", tags=["Health"])
-async def health_check(response: Response):
+@app.get("/health", tags=["Health"], response_class=ORJSONResponse)
+async def health_check():
     """
     Modern health check endpoint with system metrics and database status
     """
-    uptime_seconds = time.time() - SERVICE_START_TIME
+    now = time.time()
+    uptime_seconds = now - SERVICE_START_TIME
+    timestamp = format_utc_timestamp(now) + "Z"
+    cache_control = f"max-age={int(_HEALTH_TTL)}"
 
-    health_data: Dict[str, Any] = {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "uptime": f"{uptime_seconds:.2f}s",
-        "environment": os.getenv("NODE_ENV", "unknown"),
-    }
+    cached = _HEALTH_CACHE["payload"]
+    if cached is not None and time.monotonic() < _HEALTH_CACHE["expires"]:
+        # Metrics come from the cache; keep the clock fields current
+        return ORJSONResponse(
+            {
+                **cached,
+                "timestamp": timestamp,
+                "uptime": f"{uptime_seconds:.2f}s",
+            },
+            status_code=_HEALTH_CACHE["status_code"],
+            headers={"Cache-Control": cache_control, "X-Cache": "HIT"},
+        )
 
     # System metrics
     try:
-        memory = psutil.virtual_memory()
+        # Only sample inline if the background sampler has not run yet
+        snapshot = _system_snapshot or _sample_system()
+        memory = snapshot.memory
         system_info: Dict[str, Any] = {
             "memory": {
-                "total_mb": round(memory.total / 1024 / 1024),
-                "available_mb": round(memory.available / 1024 / 1024),
+                "total_mb": memory.total >> 20,
+                "available_mb": memory.available >> 20,
                 "usage_percent": memory.percent,
             },
-            "cpu_percent": psutil.cpu_percent(interval=0.1),
-            "platform": os.uname().sysname if hasattr(os, "uname") else "unknown",
+            "cpu_percent": snapshot.cpu_percent,
+            "platform": _PLATFORM,
         }
-        health_data["system"] = system_info
     except Exception as e:
-        health_data["system"] = {"error": str(e)}
+        system_info = {"error": str(e)}
+
+    health_data: Dict[str, Any] = {
+        "status": "healthy",
+        "timestamp": timestamp,
+        "uptime": f"{uptime_seconds:.2f}s",
+        "environment": os.getenv("NODE_ENV", "unknown"),
+        "system": system_info,
+    }
 
     status_code = 200 if health_data["status"] == "healthy" else 503
-    response.status_code = status_code
 
-    return health_data
+    _HEALTH_CACHE.update(
+        payload=health_data,
+        status_code=status_code,
+        expires=time.monotonic() + _HEALTH_TTL,
+    )
+
+    return ORJSONResponse(
+        health_data,
+        status_code=status_code,
+        headers={"Cache-Control": cache_control, "X-Cache": "MISS"},
+    )
@@ -25,3 +25,24 @@ class MessageRole(str, Enum):
 class ChatMode(str, Enum):
     STANDARD = "standard"
     SUPPORT = "support"
+
+
+# Plain-string aliases for hot paths; avoid the Enum attribute lookup and
+# match what pydantic stores for models using use_enum_values
+LOG_TOKEN_USAGE = LogType.TOKEN_USAGE.value
+LOG_ERROR = LogType.ERROR.value
+LOG_WARNING = LogType.WARNING.value
+LOG_INFO = LogType.INFO.value
+LOG_SECURITY = LogType.SECURITY.value
+LOG_PERFORMANCE = LogType.PERFORMANCE.value
+
+STATUS_SUCCESS = Status.SUCCESS.value
+STATUS_ERROR = Status.ERROR.value
+STATUS_WARNING = Status.WARNING.value
+
+MSG_ASSISTANT = MessageRole.ASSISTANT.value
+MSG_SYSTEM = MessageRole.SYSTEM.value
+MSG_USER = MessageRole.USER.value
+
+MODE_STANDARD = ChatMode.STANDARD.value
+MODE_SUPPORT = ChatMode.SUPPORT.value
@@ -1,6 +1,6 @@
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from models.enum import ChatMode
 from models.respons_schemas import ConversationResponse
@@ -14,6 +14,8 @@ class RiskAssessmentRequest(BaseModel):
 
 
 class SupportMetadata(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     user_id: Optional[int] = Field(None, description="Original user id")
     account_id: Optional[int] = Field(None, description="Support account id override")
     user: Optional[Dict[str, Any]] = Field(
@@ -22,6 +24,8 @@ class SupportMetadata(BaseModel):
 
 
 class ChatRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     content: str
     context: List[ConversationResponse] = Field(
         default_factory=list, description="Conversation history for context"
@@ -35,6 +39,8 @@ class ChatRequest(BaseModel):
 
 
 class SupportChatRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     message: str = Field(..., min_length=1, description="User message")
     context: Optional[str] = Field(default="support", description="Chat context")
     user_id: Optional[int] = Field(None, description="User ID")
@@ -42,6 +48,8 @@ class SupportChatRequest(BaseModel):
 
 
 class GenerateConversationTitleRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     messages: List[ConversationResponse]
 
 
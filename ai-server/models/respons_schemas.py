@@ -36,6 +36,8 @@ class VectorStoreOperationResponse(BaseModel):
 
 
 class ConversationResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     content: str
     role: str
 
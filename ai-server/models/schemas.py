@@ -1,14 +1,26 @@
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List, Dict, Any, Literal, Type
+import functools
+import time
+import orjson
+from types import MappingProxyType
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr, SerializerFunctionWrapHandler, field_serializer, model_serializer
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Literal, Mapping, NamedTuple, Tuple, Type, Union
 from datetime import datetime
 from sqlalchemy import Column, Integer, String, DateTime
 from core.database import Base
-from models.enum import LogType, Status, MessageRole
+from models.enum import (
+    LOG_ERROR,
+    STATUS_ERROR,
+    LogType,
+    Status,
+)
+from utils.helper import format_utc_timestamp
 from typing_extensions import TypedDict
 
 
 # Vector Store and Document Processing Models
 class DocumentSource(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     path: str
     name: str
     id: int
@@ -33,12 +45,56 @@ class ModelUsage(BaseModel):
     response_time_ms: int = 0
 
 
+class _ModelUsage:
+    """add_usage's unvalidated per-call record; becomes a ModelUsage on serialization"""
+
+    __slots__ = (
+        "model",
+        "prompt_tokens",
+        "completion_tokens",
+        "total_tokens",
+        "cost",
+        "response_time_ms",
+    )
+
+    def __init__(
+        self,
+        model: str,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        total_tokens: int = 0,
+        cost: float = 0.0,
+        response_time_ms: int = 0,
+    ):
+        self.model = model
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.total_tokens = total_tokens
+        self.cost = cost
+        self.response_time_ms = response_time_ms
+
+    def to_model(self) -> ModelUsage:
+        return ModelUsage(
+            model=self.model,
+            prompt_tokens=self.prompt_tokens,
+            completion_tokens=self.completion_tokens,
+            total_tokens=self.total_tokens,
+            cost=self.cost,
+            response_time_ms=self.response_time_ms,
+        )
+
+
 class ChatbotUsageLog(BaseModel):
+    # Store enum fields as their raw string values
+    model_config = ConfigDict(use_enum_values=True)
+
     conversation_id: Optional[int] = None
     message_id: Optional[int] = None
 
-    # List of model usages
+    # List of model usages; add_usage records go to _usage_records and are
+    # converted into this list when the log is serialized
     model_usages: List[ModelUsage] = Field(default_factory=list)
+    _usage_records: List[_ModelUsage] = PrivateAttr(default_factory=list)
 
     # Aggregated totals
     total_tokens: int = 0
@@ -49,7 +105,25 @@ class ChatbotUsageLog(BaseModel):
     log_type: LogType = LogType.INFO
     status: Status = Status.SUCCESS
     message: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Epoch seconds; formatted as an ISO string only when the log is serialized
+    created_at: float = Field(default_factory=time.time)
+
+    @field_serializer("created_at")
+    def _serialize_created_at(self, value: float) -> str:
+        return format_utc_timestamp(value)
+
+    @model_serializer(mode="wrap")
+    def _serialize_usages(self, handler: SerializerFunctionWrapHandler) -> Dict[str, Any]:
+        # Also runs when the log is nested in another model or dumped by FastAPI
+        if self._usage_records:
+            self.model_usages.extend(record.to_model() for record in self._usage_records)
+            self._usage_records.clear()
+        return handler(self)
+
+    def iter_usages(self) -> Iterator[Union[ModelUsage, _ModelUsage]]:
+        """Yield serialized and pending usages in the order they were added"""
+        yield from self.model_usages
+        yield from self._usage_records
 
     def add_usage(
         self,
@@ -61,7 +135,7 @@ class ChatbotUsageLog(BaseModel):
         response_time_ms: int = 0,
     ):
         """Add usage for a specific model"""
-        usage = ModelUsage(
+        usage = _ModelUsage(
             model=model,
             prompt_tokens=prompt_tokens,
             completion_tokens=completion_tokens,
@@ -69,7 +143,7 @@ class ChatbotUsageLog(BaseModel):
             cost=cost,
             response_time_ms=response_time_ms,
         )
-        self.model_usages.append(usage)
+        self._usage_records.append(usage)
 
         # Update totals
         self.total_tokens += total_tokens
@@ -79,23 +153,15 @@ class ChatbotUsageLog(BaseModel):
     @classmethod
     def create_error_log(cls, message: str) -> "ChatbotUsageLog":
         """Create an error log instance"""
-        return cls(log_type=LogType.ERROR, status=Status.ERROR, message=message)
+        return cls(log_type=LOG_ERROR, status=STATUS_ERROR, message=message)
 
 
-class ChatHistory(BaseModel):
-    """Schema for chat history entries"""
+class ChatHistory(NamedTuple):
+    """Chat history entry; `tuple(entry)` gives the `(role, content)` pair"""
 
-    model_config = ConfigDict(from_attributes=True)
-
-    role: MessageRole
+    role: str  # a MessageRole value
     content: str
 
-    def __init__(self, role: str, content: str):
-        super().__init__(role=role, content=content)
-
-    def model_dump(self, **kwargs):
-        return (self.role, self.content)
-
 
 class ChatbotSqlTemplate(Base):
     """Model for storing SQL query templates for the chatbot."""
@@ -122,10 +188,14 @@ class ChatbotSqlTemplate(Base):
         if not templates:
             return []
 
-        return [
-            {"input": template.input_text, "query": template.query}
-            for template in templates
-        ]
+        return list(ChatbotSqlTemplate.iter_templates(templates))
+
+    @staticmethod
+    def iter_templates(
+        templates: Iterable["ChatbotSqlTemplate"],
+    ) -> Iterator[Dict[str, str]]:
+        """Lazily yield few-shot entries so callers can stream them into a prompt."""
+        return ({"input": t.input_text, "query": t.query} for t in templates)
 
 
 class AgentResponse(BaseModel):
@@ -192,11 +262,12 @@ class DetermineAnswerSourceResult(BaseModel):
         ),
     )
 
-    def prioritized_sources(self) -> List[str]:
-        """Remove casual when higher-fidelity sources exist."""
-        prioritized = list(self.sources) or ["casual"]
+    @functools.cached_property
+    def prioritized_sources(self) -> Tuple[str, ...]:
+        """Remove casual when higher-fidelity sources exist (computed once per result)."""
+        prioritized = tuple(self.sources) or ("casual",)
         if len(prioritized) > 1 and "casual" in prioritized:
-            prioritized = [s for s in prioritized if s != "casual"] or ["casual"]
+            prioritized = tuple(s for s in prioritized if s != "casual") or ("casual",)
         return prioritized
 
 
@@ -232,7 +303,29 @@ class SQLQueryResponse(BaseModel):
         description="Short explanation of how the query answers the question.",
     )
 
-DETERMINE_ANSWER_SOURCE_SCHEMA: Dict[str, Any] = {
+class AnswerReviewResponse(BaseModel):
+    """Model for the fused SQL answer verification/improvement response."""
+
+    rating: int = Field(..., description="Quality rating of the current answer, 1-10.")
+    evaluation: str = Field(..., description="Short evaluation of the current answer.")
+    improved: bool = Field(
+        ..., description="True if final_answer differs from the current answer."
+    )
+    final_answer: str = Field(
+        ..., description="Improved answer, or the current answer if no change is needed."
+    )
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts to MappingProxyType and lists to tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+DETERMINE_ANSWER_SOURCE_SCHEMA: Mapping[str, Any] = _freeze({
     "type": "json_schema",
     "json_schema": {
         "name": "determine_answer_source",
@@ -271,18 +364,23 @@ DETERMINE_ANSWER_SOURCE_SCHEMA: Dict[str, Any] = {
             "required": ["sources", "improved_question"],
         },
     },
-}
+})
 
 
-def build_openrouter_schema(name: str, model_cls: Type[BaseModel]) -> Dict[str, Any]:
-    """Helper to convert Pydantic models into OpenRouter response_format payloads."""
-    return {
+@functools.lru_cache(maxsize=None)
+def build_openrouter_schema(name: str, model_cls: Type[BaseModel]) -> Mapping[str, Any]:
+    """Helper to convert Pydantic models into OpenRouter response_format payloads.
+
+    Results are memoized per (name, model) and returned read-only, since the
+    same mapping is shared by every caller.
+    """
+    return _freeze({
         "type": "json_schema",
         "json_schema": {
             "name": name,
             "schema": model_cls.model_json_schema(),
         },
-    }
+    })
 
 
 DOCUMENT_QA_RESPONSE_SCHEMA = build_openrouter_schema(
@@ -294,6 +392,18 @@ DOCUMENT_ANALYSIS_RESPONSE_SCHEMA = build_openrouter_schema(
 SQL_QUERY_RESPONSE_SCHEMA = build_openrouter_schema(
     "sql_query_response", SQLQueryResponse
 )
+ANSWER_REVIEW_RESPONSE_SCHEMA = build_openrouter_schema(
+    "answer_review_response", AnswerReviewResponse
+)
+
+# Pre-serialized response_format payloads; OpenRouterService embeds these bytes
+# into the request body as-is instead of re-encoding the schema on every call.
+# default=dict unwraps the read-only (_freeze) mappings
+DETERMINE_ANSWER_SOURCE_SCHEMA_JSON = orjson.dumps(DETERMINE_ANSWER_SOURCE_SCHEMA, default=dict)
+DOCUMENT_QA_RESPONSE_SCHEMA_JSON = orjson.dumps(DOCUMENT_QA_RESPONSE_SCHEMA, default=dict)
+DOCUMENT_ANALYSIS_RESPONSE_SCHEMA_JSON = orjson.dumps(DOCUMENT_ANALYSIS_RESPONSE_SCHEMA, default=dict)
+SQL_QUERY_RESPONSE_SCHEMA_JSON = orjson.dumps(SQL_QUERY_RESPONSE_SCHEMA, default=dict)
+ANSWER_REVIEW_RESPONSE_SCHEMA_JSON = orjson.dumps(ANSWER_REVIEW_RESPONSE_SCHEMA, default=dict)
 
 
 class RiskAssessmentModel(BaseModel):
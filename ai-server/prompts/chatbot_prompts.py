@@ -1,75 +1,50 @@
 from __future__ import annotations
 
-from typing import Iterable, Sequence
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
 
 
-def _join_items(items: Iterable[str]) -> str:
-    return ", ".join([item for item in items if item])
-
-
-def build_conversation_title_prompt(conversation_text: str) -> str:
-    return f"""You are a helpful assistant that generates a short, descriptive title for a conversation.
-Based on the conversation below, create a concise title (maximum 6 words) that captures the main topic.
-
-Conversation:
-{conversation_text}
-
+# Static prompt text lives in module constants; the builders only fill the
+# variable slots with str.format_map.
+_TITLE_SYSTEM_TEXT = """You are a helpful assistant that generates a short, descriptive title for a conversation.
+Based on the conversation provided by the user, create a concise title (maximum 6 words) that captures the main topic.
 Generate only the title, nothing else."""
 
+_TITLE_USER_TEMPLATE = "Conversation:\n{conversation_text}"
 
-def build_routing_prompt(
-    *,
-    question: str,
-    conversation_history: str,
-    database_keywords: Sequence[str],
-    document_keywords: Sequence[str],
-    conversation_mode: str = "chat",
-    site_map: str = "",
-) -> str:
-    db_hint = _join_items(database_keywords)
-    doc_hint = _join_items(document_keywords)
-    history = conversation_history or "No prior conversation."
-    site_map_text = site_map or "No site map context provided."
-    mode_hint = (conversation_mode or "chat").lower()
-    mode_rules = ""
-    if mode_hint == "support":
-        mode_rules = (
-            "- Support mode: default to 'casual' unless the user explicitly asks for "
-            "database metrics or document references. Only include database/document "
-            "sources when the question clearly requires structured data.\n"
-        )
-    return f"""You are a routing assistant for Risksoft. Decide which knowledge sources the assistant should consult for the latest user message and lightly correct typos without changing acronyms (e.g., keep DFI).
-
-Question: {question}
-
-Conversation History:
-{history}
+_SUPPORT_MODE_RULES = (
+    "- Support mode: default to 'casual' unless the user explicitly asks for "
+    "database metrics or document references. Only include database/document "
+    "sources when the question clearly requires structured data.\n"
+)
 
-Risksoft Information (site map):
-{site_map_text}
+_ROUTING_INSTRUCTIONS_TEMPLATE = """You are a routing assistant for Risksoft. Decide which knowledge sources the assistant should consult for the latest user message and lightly correct typos without changing acronyms (e.g., keep DFI).
 
 Rules:
 - Current mode: {mode_hint}
 {mode_rules}- Possible sources: database (for metrics, reports, analytics), document (policies, procedures, general knowledge), casual (small talk about Risksoft).
-- Database keywords: {db_hint}
-- Document keywords: {doc_hint}
+- Database keywords:
+{database_keywords_block}
+- Document keywords:
+{document_keywords_block}
 - Multiple sources are allowed but only include what is necessary.
 - Prefer database/document over casual when both apply.
-- If you return only the 'casual' source, also provide a helpful final reply in the `casual_response` field. Use the conversation history and site map above to add context or relevant links (markdown links should start with https://app.risksoft.com.tr/).
+- If you return only the 'casual' source, also provide a helpful final reply in the `casual_response` field. Use the conversation history and site map to add context or relevant links (markdown links should start with https://app.risksoft.com.tr/).
 - improved_question must be the same question with only obvious typos fixed (return the original text if no fixes are needed). Never expand abbreviations or alter intent.
 """
 
+_ROUTING_SITE_MAP_TEMPLATE = """Risksoft Information (site map):
+{site_map_text}
+"""
 
-def build_service_response_prompt(
-    *,
-    question: str,
-    source_types: Sequence[str],
-    raw_result: str,
-    conversation_history: str,
-) -> str:
-    history = conversation_history or "No prior conversation."
-    sources = _join_items(source_types) or "casual"
-    return f"""Your name is Risksoft AI, a helpful assistant that creates clear and detailed responses. Always respond in the language of the question asked.
+_ROUTING_USER_TEMPLATE = """Question: {question}
+
+Conversation History:
+{history}
+"""
+
+_SERVICE_RESPONSE_TEMPLATE = """Your name is Risksoft AI, a helpful assistant that creates clear and detailed responses. Always respond in the language of the question asked.
 Summarize the result in plain, user-friendly language, highlight only the essential metrics, and avoid exposing sensitive identifiers (account IDs, record IDs, usernames, e-mail addresses, IPs, etc.). When a number must be referenced, describe it generically (e.g., "ilgili hesap" instead of "Hesap ID 204").
 If the information comes from multiple sources (e.g., database and documents), synthesize it into a single coherent narrative.
 
@@ -86,15 +61,7 @@ Conversation History:
 
 Provide your response:"""
 
-
-def build_site_map_prompt(
-    *,
-    question: str,
-    site_map: str,
-    conversation_history: str,
-) -> str:
-    history = conversation_history or "No prior conversation."
-    return f"""You are a helpful assistant that generates a response to a question based on both the conversation history and Risksoft information.
+_SITE_MAP_TEMPLATE = """You are a helpful assistant that generates a response to a question based on both the conversation history and Risksoft information.
 
 Question: {question}
 
@@ -105,3 +72,138 @@ Below is the site map. If there is any relevant information related to the quest
 Conversation History:
 {history}
 """
+
+
+# Identifiers the service-response prompt asks the model not to expose; all
+# kinds are matched in a single scan and replaced per kind
+_SENSITIVE_RE = re.compile(
+    r"(?P<account>\b(?:Hesap|Account) ID\s*:?\s*\d+)"
+    r"|(?P<user>\buser(?:name)?=[\w.@-]+)"
+    r"|(?P<email>\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b)"
+    r"|(?P<ip>\b\d{1,3}(?:\.\d{1,3}){3}\b)",
+    re.IGNORECASE,
+)
+_SENSITIVE_REPLACEMENTS = {
+    "account": "ilgili hesap",
+    "user": "ilgili kullanıcı",
+    "email": "[e-posta]",
+    "ip": "[IP]",
+}
+
+
+def redact_sensitive_identifiers(text: str) -> str:
+    """Mask account IDs, usernames, e-mail addresses and IPs left in a model answer."""
+    return _SENSITIVE_RE.sub(lambda m: _SENSITIVE_REPLACEMENTS[m.lastgroup], text)
+
+
+@lru_cache(maxsize=128)
+def _join_items(items: Tuple[str, ...]) -> str:
+    return ", ".join(filter(None, items))
+
+
+def format_keyword_block(keywords: Iterable[str]) -> str:
+    """Render keywords as a sorted, de-duplicated bullet list (call once at import)."""
+    return "\n".join(f"  - {keyword}" for keyword in sorted(set(keywords)) if keyword)
+
+
+def _cacheable_text(text: str) -> Dict[str, Any]:
+    """Text content block marked as a provider-side prompt cache breakpoint."""
+    return {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+
+
+@lru_cache(maxsize=16)
+def _routing_instructions(
+    mode_hint: str, database_keywords_block: str, document_keywords_block: str
+) -> str:
+    """The instructions only vary by mode and the (constant) keyword blocks."""
+    return _ROUTING_INSTRUCTIONS_TEMPLATE.format_map(
+        {
+            "mode_hint": mode_hint,
+            "mode_rules": _SUPPORT_MODE_RULES if mode_hint == "support" else "",
+            "database_keywords_block": database_keywords_block,
+            "document_keywords_block": document_keywords_block,
+        }
+    )
+
+
+def build_conversation_title_prompt(conversation_text: str) -> List[Dict[str, Any]]:
+    return [
+        {"role": "system", "content": [_cacheable_text(_TITLE_SYSTEM_TEXT)]},
+        {
+            "role": "user",
+            "content": _TITLE_USER_TEMPLATE.format_map(
+                {"conversation_text": conversation_text}
+            ),
+        },
+    ]
+
+
+def build_routing_prompt(
+    *,
+    question: str,
+    conversation_history: str,
+    database_keywords_block: str,
+    document_keywords_block: str,
+    conversation_mode: str = "chat",
+    site_map: str = "",
+) -> List[Dict[str, Any]]:
+    """
+    Build the routing messages. The instructions and the site map do not depend
+    on the question, so they go first as cacheable system blocks and only the
+    question/history are sent as the variable user turn.
+    """
+    mode_hint = (conversation_mode or "chat").lower()
+    instructions = _routing_instructions(
+        mode_hint, database_keywords_block, document_keywords_block
+    )
+    site_map_block = _ROUTING_SITE_MAP_TEMPLATE.format_map(
+        {"site_map_text": site_map or "No site map context provided."}
+    )
+    user_turn = _ROUTING_USER_TEMPLATE.format_map(
+        {
+            "question": question,
+            "history": conversation_history or "No prior conversation.",
+        }
+    )
+    return [
+        {
+            "role": "system",
+            "content": [
+                _cacheable_text(instructions),
+                _cacheable_text(site_map_block),
+            ],
+        },
+        {"role": "user", "content": user_turn},
+    ]
+
+
+def build_service_response_prompt(
+    *,
+    question: str,
+    source_types: Sequence[str],
+    raw_result: str,
+    conversation_history: str,
+) -> str:
+    return _SERVICE_RESPONSE_TEMPLATE.format_map(
+        {
+            "question": question,
+            "sources": _join_items(tuple(source_types)) or "casual",
+            "raw_result": raw_result,
+            "history": conversation_history or "No prior conversation.",
+        }
+    )
+
+
+def build_site_map_prompt(
+    *,
+    question: str,
+    site_map: str,
+    conversation_history: str,
+) -> str:
+    return _SITE_MAP_TEMPLATE.format_map(
+        {
+            "question": question,
+            "site_map": site_map,
+            "history": conversation_history or "No prior conversation.",
+        }
+    )
@@ -1,10 +1,19 @@
-from typing import Any, Dict, List, Optional, Tuple
+import sys
+import textwrap
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
 
 
-LANGUAGE_LABELS = {"tr": "Turkish", "en": "English"}
+_TR = sys.intern("tr")
+_EN = sys.intern("en")
+DEFAULT_LANGUAGE = _TR
 
-AFFECTED_PEOPLE_OPTIONS = {
-    "tr": [
+LANGUAGE_LABELS: Mapping[str, str] = MappingProxyType({_TR: "Turkish", _EN: "English"})
+_LANGUAGE_LABEL_FALLBACK = LANGUAGE_LABELS[DEFAULT_LANGUAGE]
+
+AFFECTED_PEOPLE_OPTIONS: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    _TR: (
         "Maruz kalan kişi",
         "Yakın mesafede bulunan kişi/kişiler",
         "Uzak mesafede bulunan kişi/kişiler",
@@ -14,8 +23,8 @@ AFFECTED_PEOPLE_OPTIONS = {
         "Mahallede bulunan yerleşim alanları",
         "Birden fazla mahallede bulunan yerleşim alanları",
         "İlçe/Şehrin önemli büyüklüğünü kapsayan yerleşim alanları",
-    ],
-    "en": [
+    ),
+    _EN: (
         "Exposed person",
         "People in close proximity",
         "People at a distance",
@@ -25,7 +34,18 @@ AFFECTED_PEOPLE_OPTIONS = {
         "Residential areas in neighborhood",
         "Residential areas across multiple neighborhoods",
         "Residential areas covering significant portion of district/city",
-    ],
+    ),
+})
+SUPPORTED_LANGUAGES = frozenset(AFFECTED_PEOPLE_OPTIONS)
+# Common spellings resolve without lower-casing; anything else takes the slow path
+_LANGUAGE_DISPATCH: Dict[Optional[str], str] = {
+    None: DEFAULT_LANGUAGE,
+    "": DEFAULT_LANGUAGE,
+    **{
+        spelling: code
+        for code in SUPPORTED_LANGUAGES
+        for spelling in (code, code.upper(), code.capitalize())
+    },
 }
 
 METHOD_REQUIREMENTS = {
@@ -56,6 +76,20 @@ FALLBACK_METHOD_INSTRUCTIONS = [
     "If your methodology requires additional factors (e.g., `frequency`), include them and explain the supporting evidence.",
 ]
 
+# Bullet-list renderings of the static option/instruction lists above
+AFFECTED_PEOPLE_OPTIONS_RENDERED: Dict[str, str] = {
+    language_code: "\n".join(f"- {option}" for option in options)
+    for language_code, options in AFFECTED_PEOPLE_OPTIONS.items()
+}
+_AFFECTED_PEOPLE_FALLBACK = AFFECTED_PEOPLE_OPTIONS_RENDERED[DEFAULT_LANGUAGE]
+METHOD_INSTRUCTION_BLOCKS: Dict[str, str] = {
+    method_key: "\n".join(f"- {instruction}" for instruction in info["instructions"])
+    for method_key, info in METHOD_REQUIREMENTS.items()
+}
+FALLBACK_INSTRUCTION_BLOCK = "\n".join(
+    f"- {instruction}" for instruction in FALLBACK_METHOD_INSTRUCTIONS
+)
+
 SCORING_REFERENCES = {
     "5X5": {
         "possibility": [
@@ -184,54 +218,264 @@ SCORING_REFERENCES = {
 }
 
 
+_IMAGE_EXTS = frozenset({"jpg", "jpeg", "png", "gif", "bmp", "webp", "tif", "tiff"})
+_IMAGE_MIME_PREFIX = "image/"
+# Same text _format_resource_lines produces for an empty image list
+_NO_IMAGES = "- (No images provided)"
+
+class _Resource(NamedTuple):
+    """Uploaded document/image entry produced by _split_uploaded_resources."""
+
+    url: Optional[str]
+    name: Optional[str]
+    size: Any
+    key: Optional[str]
+    mime_type: Optional[str]
+
+
+def _render_resource(idx: int, resource: Any, label: str) -> Optional[str]:
+    """One resource as a bullet line (plus a storage_key line); None for unsupported entries."""
+    if isinstance(resource, _Resource):
+        name, size, key, url = resource.name, resource.size, resource.key, resource.url
+    # Bare URL strings are the common case for callers passing plain lists
+    elif isinstance(resource, str):
+        name = size = key = None
+        url = resource
+    elif isinstance(resource, dict):
+        name = resource.get("name")
+        size = resource.get("size")
+        key = resource.get("key")
+        url = resource.get("url") or resource.get("path") or resource.get("source")
+    else:
+        return None
+
+    if name and size:
+        details = " (%s, %s MB)" % (name, size)
+    elif name:
+        details = " (%s)" % (name,)
+    elif size:
+        details = " (%s MB)" % (size,)
+    else:
+        details = ""
+    line = "- %s %d%s" % (label, idx + 1, details)
+    if url:
+        line = "%s: %s" % (line, url)
+    return "%s\n  storage_key: %s" % (line, key) if key else line
+
+
+@lru_cache(maxsize=1024)
+def _render_question_context(
+    control_list_name: Optional[str],
+    question: Optional[str],
+    question_id: Optional[int],
+    keywords: Optional[str],
+) -> str:
+    """Question context section for the fixed keys used by build_ai_help_prompt_payload."""
+    section = "\nQuestion context:"
+    if control_list_name is not None:
+        section += f"\n- Control list: {control_list_name}"
+    if question is not None:
+        section += f"\n- Question: {question}"
+    if question_id is not None:
+        section += f"\n- Question ID: {question_id}"
+    if keywords:
+        section += f"\n- Keywords: {keywords}"
+    return section
+
+
+def _render_json_template(output_language: str, include_frequency: bool) -> str:
+    lines = [
+        "{",
+        f'  "legal_basis": "<List at least two relevant legal references in {output_language}, linking each citation to the observed hazards and control list focus>",',
+        f'  "affected_people": ["<Select every impacted group in {output_language}>"],',
+        f'  "risks": "<Describe all observable controls or confirm their absence in {output_language}; note verification steps if visibility is limited>",',
+        f'  "cautions": "<Use newline-separated bullet points (e.g., - ...) in {output_language} to cover immediate, cascading, and long-term risks; cite image evidence, question context, and user context explicitly>",',
+        f'  "current_cautions": "<Provide layered preventive and corrective actions in {output_language}, grouping engineering, administrative, and PPE controls with responsible roles and target timelines>",',
+        '  "possibility": 3,',
+    ]
+    if include_frequency:
+        lines.append('  "intensity": 4,')
+        lines.append('  "frequency": 2')
+    else:
+        lines.append('  "intensity": 4')
+    lines.append("}")
+    return "\n".join(lines)
+
+
+# Only two languages and two endings exist, so all four JSON templates are built once
+_JSON_TEMPLATES: Dict[Tuple[str, bool], str] = {
+    (language_code, include_frequency): _render_json_template(
+        LANGUAGE_LABELS.get(language_code, _LANGUAGE_LABEL_FALLBACK),
+        include_frequency,
+    )
+    for language_code in SUPPORTED_LANGUAGES
+    for include_frequency in (True, False)
+}
+
+
+_KEYWORDS_CONTEXT = (
+    "Keywords provided by the user must be addressed explicitly in the findings."
+)
+_DOCUMENTS_CONTEXT = (
+    "Supporting documents are listed below; cite them explicitly alongside relevant observations."
+)
+# Additional AI help context keyed by (has keywords, has supporting documents)
+_ADDITIONAL_CONTEXT: Dict[Tuple[bool, bool], Optional[str]] = {
+    (False, False): None,
+    (True, False): _KEYWORDS_CONTEXT,
+    (False, True): _DOCUMENTS_CONTEXT,
+    (True, True): f"{_KEYWORDS_CONTEXT}\n{_DOCUMENTS_CONTEXT}",
+}
+
+
+_FALLBACK_SCORING_REFERENCE = (
+    "Scoring reference: Provide detailed, evidence-based justifications for every "
+    "numeric value and translate descriptors into the requested output language."
+)
+
+
+def _render_scoring_reference(method_key: str, output_language: str) -> str:
+    reference = SCORING_REFERENCES.get(method_key)
+    if not reference:
+        return _FALLBACK_SCORING_REFERENCE
+
+    lines: List[str] = [
+        f"Use the following descriptors (translate them into {output_language}) when explaining why each score was selected:",
+    ]
+    for dimension, entries in reference.items():
+        title = dimension.replace("_", " ").title()
+        lines.append(f"{title}:")
+        for entry in entries:
+            lines.append(f"- Score {entry['score']}: {entry['description']}")
+    return "\n".join(lines)
+
+
+# Scoring references are static; render every (method, output language) pair once
+_SCORING_REFERENCE_CACHE: Dict[Tuple[str, str], str] = {
+    (method_key, output_language): _render_scoring_reference(method_key, output_language)
+    for method_key in SCORING_REFERENCES
+    for output_language in LANGUAGE_LABELS.values()
+}
+
+
+# Templates are dedented and stripped once here so source indentation is not
+# sent to the model
+_QUESTION_PROMPT_TEMPLATE = textwrap.dedent(
+    """
+        You are an occupational health and safety expert. Based on the given title and description, create specific risk assessment questions that would help identify potential hazards and safety measures.
+
+        Title: {title}
+        Description: {description}
+
+        Generate practical, actionable questions that a safety inspector would ask during a risk assessment. Focus on:
+        - Physical hazards and conditions
+        - Safety measures and controls
+        - Compliance with safety standards
+        - Equipment and environmental factors
+        - Emergency preparedness
+
+        Return your response as a JSON array of strings, where each string is a specific question. Each question should be clear, direct, and focused on a specific safety aspect.
+
+        Examples of good questions:
+        - "Are ground deformations, collapses, and bumps eliminated?"
+        - "Are stair widths and step heights appropriate?"
+        - "Is personal protective equipment properly maintained and accessible?"
+        - "Are emergency exits clearly marked and unobstructed?"
+
+        Important: Return the questions in the same language as the title and description provided. If the title and description are in Turkish, return questions in Turkish. If they are in English, return questions in English.
+
+        Format your response as a clean JSON array:
+        ["Question 1", "Question 2", "Question 3", ...]
+        """
+).strip()
+
+_AI_HELP_SYSTEM_TEMPLATE = textwrap.dedent(
+    """
+You are an experienced occupational health and safety expert. Analyze the images provided by the user directly to produce a risk assessment using the {method_label} methodology.
+
+Grounding rules:
+- Base every conclusion strictly on visual evidence from the images and on the content of the supporting documents listed by the user.
+- Confirm whether each image URL is reachable; if you cannot load an image or the visual content is unclear, state "Image <index> unavailable" in your findings and avoid speculation.
+- Reference image numbers (and document identifiers when applicable) when citing evidence, e.g., "Image 1" or "Document 2".
+- If no images are available, state this clearly in the JSON output and avoid inventing details.
+- Do not rely on previously generated descriptions; inspect the images and documents directly each time.
+
+Context integration requirements:
+- Explicitly weave the provided user context into your analysis; quote critical phrases or data points when relevant.
+- Tie your assessment to the control list or question context (e.g., reference the question text, checklist name, IDs) and explain how the observed hazards affect compliance.
+- Call out any assumptions you cannot verify due to limited visibility and recommend follow-up inspection steps or document reviews.
+
+Analytical expectations:
+- In `risks`, evaluate what is visibly compliant, what is missing, and how to confirm uncertain controls (include verification methods when visibility is limited).
+- In `cautions`, cover immediate, cascading, and long-term effects; articulate severity reasoning aligned with the {method_label} ratings.
+- In `current_cautions`, combine engineering, administrative, and PPE measures, assign responsible roles, and suggest implementation timelines.
+
+Method requirements:
+{method_instructions}
+
+Scoring guidance:
+{scoring_reference}
+
+Output requirements:
+- Return a single JSON object only; do not include additional prose.
+- Write every field value in {output_language} with full sentences or bullet lists as instructed above.
+- Select `affected_people` entries exclusively from this list ({output_language}):
+{affected_people_options}
+- When citing numeric scores, explicitly mention (within your narrative text) the descriptor that matches each selected value and explain how the visual evidence supports it.
+- Provide at least two legal citations (e.g., Law 6331, Law 4857, OSHA/ISO standards) and connect them to the findings.
+- Ensure every risk, control, and rating is explicitly supported by visual evidence or clearly stated limitations.
+
+Use the following JSON structure and replace the placeholders with your findings:
+{json_template}
+"""
+).strip()
+
+_AI_HELP_USER_TEMPLATE = """
+Images to analyze:
+{images_section}
+{supporting_documents_section}
+{context_section}{question_section}
+"""
+
+
 class RiskAssessmentPrompts:
-    def __init__(self):
-        pass
+    """Stateless namespace for the risk assessment prompt builders."""
 
-    def _normalize_language(self, language: Optional[str]) -> str:
-        if not language:
-            return "tr"
+    @staticmethod
+    def _normalize_language(language: Optional[str]) -> str:
+        normalized = _LANGUAGE_DISPATCH.get(language)
+        if normalized is not None:
+            return normalized
         normalized = language.lower()
-        return normalized if normalized in AFFECTED_PEOPLE_OPTIONS else "tr"
+        return normalized if normalized in SUPPORTED_LANGUAGES else DEFAULT_LANGUAGE
 
-    def _get_output_language_label(self, language_code: str) -> str:
-        return LANGUAGE_LABELS.get(language_code, LANGUAGE_LABELS["tr"])
+    @staticmethod
+    def _get_output_language_label(language_code: str) -> str:
+        return LANGUAGE_LABELS.get(language_code, _LANGUAGE_LABEL_FALLBACK)
 
-    def _format_affected_people_options(self, language_code: str) -> str:
-        options = AFFECTED_PEOPLE_OPTIONS.get(
-            language_code, AFFECTED_PEOPLE_OPTIONS["tr"]
+    @staticmethod
+    def _format_affected_people_options(language_code: str) -> str:
+        return AFFECTED_PEOPLE_OPTIONS_RENDERED.get(
+            language_code, _AFFECTED_PEOPLE_FALLBACK
         )
-        return "\n".join([f"- {option}" for option in options])
 
-    def _build_scoring_reference(self, method_key: str, output_language: str) -> str:
-        reference = SCORING_REFERENCES.get(method_key)
-        if not reference:
-            return (
-                "Scoring reference: Provide detailed, evidence-based justifications for every "
-                "numeric value and translate descriptors into the requested output language."
-            )
-
-        lines: List[str] = [
-            f"Use the following descriptors (translate them into {output_language}) when explaining why each score was selected:",
-        ]
-        for dimension, entries in reference.items():
-            title = dimension.replace("_", " ").title()
-            lines.append(f"{title}:")
-            for entry in entries:
-                lines.append(f"- Score {entry['score']}: {entry['description']}")
-        return "\n".join(lines)
+    @staticmethod
+    def _build_scoring_reference(method_key: str, output_language: str) -> str:
+        cached = _SCORING_REFERENCE_CACHE.get((method_key, output_language))
+        if cached is not None:
+            return cached
+        return _render_scoring_reference(method_key, output_language)
 
+    @staticmethod
     def _get_method_instruction_block(
-        self, analysis_method: str, output_language: str
+        analysis_method: str, output_language: str
     ) -> Tuple[str, bool, str, str]:
         method_key = (analysis_method or "").upper()
         method_info = METHOD_REQUIREMENTS.get(method_key)
         if method_info:
-            instruction_lines = "\n".join(
-                [f"- {instruction}" for instruction in method_info["instructions"]]
-            )
+            instruction_lines = METHOD_INSTRUCTION_BLOCKS[method_key]
             include_frequency = "frequency" in method_info["fields"]
-            scoring_reference = self._build_scoring_reference(
+            scoring_reference = RiskAssessmentPrompts._build_scoring_reference(
                 method_key, output_language
             )
             return (
@@ -241,182 +485,131 @@ class RiskAssessmentPrompts:
                 scoring_reference,
             )
 
-        fallback_lines = "\n".join(
-            [f"- {instruction}" for instruction in FALLBACK_METHOD_INSTRUCTIONS]
+        scoring_reference = RiskAssessmentPrompts._build_scoring_reference(
+            method_key, output_language
         )
-        scoring_reference = self._build_scoring_reference(method_key, output_language)
-        return fallback_lines, True, analysis_method or "selected", scoring_reference
+        return FALLBACK_INSTRUCTION_BLOCK, True, analysis_method or "selected", scoring_reference
 
+    @staticmethod
     def _split_uploaded_resources(
-        self, uploaded_documents: Optional[List[Dict[str, Any]]]
-    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-        image_exts = {"jpg", "jpeg", "png", "gif", "bmp", "webp", "tif", "tiff"}
-        image_resources: List[Dict[str, Any]] = []
-        other_resources: List[Dict[str, Any]] = []
+        uploaded_documents: Optional[List[Dict[str, Any]]]
+    ) -> Tuple[List[_Resource], List[_Resource], List[str]]:
+        """Split uploads into (images, other documents, image URLs) in one pass."""
+        image_resources: List[_Resource] = []
+        other_resources: List[_Resource] = []
+        image_urls: List[str] = []
 
         if not uploaded_documents:
-            return image_resources, other_resources
+            return image_resources, other_resources, image_urls
 
         for doc in uploaded_documents:
             if not isinstance(doc, dict):
                 continue
 
-            entry = {
-                "url": doc.get("url") or doc.get("path"),
-                "name": doc.get("name"),
-                "size": doc.get("size"),
-                "key": doc.get("key"),
-                "mime_type": doc.get("mime_type"),
-            }
-
-            base_name = entry["url"] or ""
-            if "?" in base_name:
-                base_name = base_name.split("?")[0]
-            if not base_name and entry["name"]:
-                base_name = entry["name"]
+            url = doc.get("url") or doc.get("path")
+            name = doc.get("name")
+            mime_type = doc.get("mime_type")
 
-            extension = ""
-            if base_name and "." in base_name:
-                extension = base_name.rsplit(".", 1)[-1].lower()
+            base_name = url.partition("?")[0] if url else ""
+            if not base_name and name:
+                base_name = name
 
-            mime_type = (entry.get("mime_type") or "").lower()
-            is_image = extension in image_exts or (
-                mime_type.startswith("image/") if mime_type else False
+            # Check the extension first; the MIME type is only consulted when it is not an image
+            is_image = (
+                "." in base_name
+                and base_name.rpartition(".")[2].lower() in _IMAGE_EXTS
             )
+            if not is_image and mime_type:
+                is_image = mime_type.lower().startswith(_IMAGE_MIME_PREFIX)
 
+            entry = _Resource(url, name, doc.get("size"), doc.get("key"), mime_type)
             if is_image:
                 image_resources.append(entry)
+                if url:
+                    image_urls.append(url)
             else:
                 other_resources.append(entry)
 
-        return image_resources, other_resources
+        return image_resources, other_resources, image_urls
 
-    def _format_resource_lines(self, resources: Optional[List[Any]], label: str) -> str:
+    @staticmethod
+    def _format_resource_lines(resources: Optional[List[Any]], label: str) -> str:
         if not resources:
             return f"- (No {label.lower()}s provided)"
 
-        lines: List[str] = []
-        for idx, resource in enumerate(resources):
-            name = None
-            size = None
-            key = None
-            url = None
-
-            if isinstance(resource, dict):
-                name = resource.get("name")
-                size = resource.get("size")
-                key = resource.get("key")
-                url = (
-                    resource.get("url")
-                    or resource.get("path")
-                    or resource.get("source")
-                )
-            elif isinstance(resource, str):
-                url = resource
-            else:
-                continue
-
-            descriptor_parts = [f"{label} {idx + 1}"]
-            detail_parts = []
-            if name:
-                detail_parts.append(str(name))
-            if size:
-                detail_parts.append(f"{size} MB")
-            if detail_parts:
-                descriptor_parts.append(f"({', '.join(detail_parts)})")
-
-            descriptor = " ".join(descriptor_parts)
-            line = f"- {descriptor}"
-            if url:
-                line += f": {url}"
-            lines.append(line)
-            if key:
-                lines.append(f"  storage_key: {key}")
-
-        return "\n".join(lines)
-
-    def _build_json_template(self, language_code: str, include_frequency: bool) -> str:
-        output_language = self._get_output_language_label(language_code)
-        lines = [
-            "{",
-            f'  "legal_basis": "<List at least two relevant legal references in {output_language}, linking each citation to the observed hazards and control list focus>",',
-            f'  "affected_people": ["<Select every impacted group in {output_language}>"],',
-            f'  "risks": "<Describe all observable controls or confirm their absence in {output_language}; note verification steps if visibility is limited>",',
-            f'  "cautions": "<Use newline-separated bullet points (e.g., - ...) in {output_language} to cover immediate, cascading, and long-term risks; cite image evidence, question context, and user context explicitly>",',
-            f'  "current_cautions": "<Provide layered preventive and corrective actions in {output_language}, grouping engineering, administrative, and PPE controls with responsible roles and target timelines>",',
-            '  "possibility": 3,',
-        ]
-        if include_frequency:
-            lines.append('  "intensity": 4,')
-            lines.append('  "frequency": 2')
-        else:
-            lines.append('  "intensity": 4')
-        lines.append("}")
-        return "\n".join(lines)
-
-    def generate_risk_assessment_questions(self, title: str, description: str) -> str:
-        return f"""
-        You are an occupational health and safety expert. Based on the given title and description, create specific risk assessment questions that would help identify potential hazards and safety measures.
-
-        Title: {title}
-        Description: {description}
-
-        Generate practical, actionable questions that a safety inspector would ask during a risk assessment. Focus on:
-        - Physical hazards and conditions
-        - Safety measures and controls
-        - Compliance with safety standards
-        - Equipment and environmental factors
-        - Emergency preparedness
-
-        Return your response as a JSON array of strings, where each string is a specific question. Each question should be clear, direct, and focused on a specific safety aspect.
-
-        Examples of good questions:
-        - "Are ground deformations, collapses, and bumps eliminated?"
-        - "Are stair widths and step heights appropriate?"
-        - "Is personal protective equipment properly maintained and accessible?"
-        - "Are emergency exits clearly marked and unobstructed?"
+        return "\n".join(
+            filter(
+                None,
+                (
+                    _render_resource(idx, resource, label)
+                    for idx, resource in enumerate(resources)
+                ),
+            )
+        )
 
-        Important: Return the questions in the same language as the title and description provided. If the title and description are in Turkish, return questions in Turkish. If they are in English, return questions in English.
+    @staticmethod
+    def _build_json_template(language_code: str, include_frequency: bool) -> str:
+        template = _JSON_TEMPLATES.get((language_code, include_frequency))
+        if template is None:
+            template = _JSON_TEMPLATES[(DEFAULT_LANGUAGE, include_frequency)]
+        return template
+
+    @staticmethod
+    def generate_risk_assessment_questions(title: str, description: str) -> str:
+        return _QUESTION_PROMPT_TEMPLATE.format_map(
+            {"title": title, "description": description}
+        )
 
-        Format your response as a clean JSON array:
-        ["Question 1", "Question 2", "Question 3", ...]
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def build_ai_help_system_prompt(analysis_method: str, language: str) -> str:
+        """
+        Instruction part of the AI help prompt. It only depends on the analysis
+        method and the output language, so it is memoized and sent as a
+        cacheable system message ahead of the per-question user turn.
         """
+        language_code = RiskAssessmentPrompts._normalize_language(language)
+        method_key = (analysis_method or "").upper()
+        sections = _PRECOMPUTED[
+            (method_key if method_key in METHOD_REQUIREMENTS else None, language_code)
+        ]
+        if sections.system_prompt is not None:
+            return sections.system_prompt
+        # Fallback method: the label is the caller's method name
+        return _render_ai_help_system_prompt(
+            sections, analysis_method or "selected"
+        )
 
-    def merge_risk_assessments(
-        self,
+    @staticmethod
+    def build_ai_help_user_prompt(
         image_paths: List[Any],
-        analysis_method: str,
-        language: str,
         additional_context: Optional[str] = None,
         question_context: Optional[Dict[str, Any]] = None,
         supporting_documents: Optional[List[Any]] = None,
+        question_section_rendered: Optional[str] = None,
     ) -> str:
-        language_code = self._normalize_language(language)
-        output_language = self._get_output_language_label(language_code)
-        affected_people_options = self._format_affected_people_options(language_code)
-        (
-            method_instructions,
-            include_frequency,
-            method_label,
-            scoring_reference,
-        ) = self._get_method_instruction_block(analysis_method, output_language)
-        json_template = self._build_json_template(language_code, include_frequency)
-
-        images_section = self._format_resource_lines(image_paths, "Image")
+        """Per-question part of the AI help prompt (resources and context)."""
+        images_section = (
+            RiskAssessmentPrompts._format_resource_lines(image_paths, "Image")
+            if image_paths
+            else _NO_IMAGES
+        )
 
         supporting_documents_section = ""
         if supporting_documents:
             supporting_documents_section = (
                 "\nSupporting documents:\n"
-                + self._format_resource_lines(supporting_documents, "Document")
+                + RiskAssessmentPrompts._format_resource_lines(
+                    supporting_documents, "Document"
+                )
             )
 
         context_section = ""
         if additional_context:
             context_section = f"\nUser context:\n{additional_context}\n"
 
-        question_section = ""
-        if question_context:
+        question_section = question_section_rendered or ""
+        if question_context and not question_section:
             question_section = "\nQuestion context:\n" + "\n".join(
                 [
                     f"- {key}: {value}"
@@ -425,51 +618,50 @@ class RiskAssessmentPrompts:
                 ]
             )
 
-        return f"""
-You are an experienced occupational health and safety expert. Analyze the provided images directly to produce a risk assessment using the {method_label} methodology.
-
-Images to analyze:
-{images_section}
-{supporting_documents_section}
-{context_section}{question_section}
-Grounding rules:
-- Base every conclusion strictly on visual evidence from the images and on the content of the supporting documents listed above.
-- Confirm whether each image URL is reachable; if you cannot load an image or the visual content is unclear, state "Image <index> unavailable" in your findings and avoid speculation.
-- Reference image numbers (and document identifiers when applicable) when citing evidence, e.g., "Image 1" or "Document 2".
-- If no images are available, state this clearly in the JSON output and avoid inventing details.
-- Do not rely on previously generated descriptions; inspect the images and documents directly each time.
-
-Context integration requirements:
-- Explicitly weave the provided user context into your analysis; quote critical phrases or data points when relevant.
-- Tie your assessment to the control list or question context (e.g., reference the question text, checklist name, IDs) and explain how the observed hazards affect compliance.
-- Call out any assumptions you cannot verify due to limited visibility and recommend follow-up inspection steps or document reviews.
-
-Analytical expectations:
-- In `risks`, evaluate what is visibly compliant, what is missing, and how to confirm uncertain controls (include verification methods when visibility is limited).
-- In `cautions`, cover immediate, cascading, and long-term effects; articulate severity reasoning aligned with the {method_label} ratings.
-- In `current_cautions`, combine engineering, administrative, and PPE measures, assign responsible roles, and suggest implementation timelines.
-
-Method requirements:
-{method_instructions}
-
-Scoring guidance:
-{scoring_reference}
+        return _AI_HELP_USER_TEMPLATE.format_map(
+            {
+                "images_section": images_section,
+                "supporting_documents_section": supporting_documents_section,
+                "context_section": context_section,
+                "question_section": question_section,
+            }
+        )
 
-Output requirements:
-- Return a single JSON object only; do not include additional prose.
-- Write every field value in {output_language} with full sentences or bullet lists as instructed above.
-- Select `affected_people` entries exclusively from this list ({output_language}):
-{affected_people_options}
-- When citing numeric scores, explicitly mention (within your narrative text) the descriptor that matches each selected value and explain how the visual evidence supports it.
-- Provide at least two legal citations (e.g., Law 6331, Law 4857, OSHA/ISO standards) and connect them to the findings.
-- Ensure every risk, control, and rating is explicitly supported by visual evidence or clearly stated limitations.
+    @staticmethod
+    def merge_risk_assessments(
+        image_paths: List[Any],
+        analysis_method: str,
+        language: str,
+        additional_context: Optional[str] = None,
+        question_context: Optional[Dict[str, Any]] = None,
+        supporting_documents: Optional[List[Any]] = None,
+        question_section_rendered: Optional[str] = None,
+    ) -> str:
+        # Image-only prompts are a pure function of their inputs and get memoized
+        if not (
+            additional_context
+            or question_context
+            or supporting_documents
+            or question_section_rendered
+        ) and all(isinstance(path, str) for path in image_paths or ()):
+            return _merge_image_only_prompt(
+                analysis_method, language, tuple(image_paths or ())
+            )
 
-Use the following JSON structure and replace the placeholders with your findings:
-{json_template}
-"""
+        system_prompt = RiskAssessmentPrompts.build_ai_help_system_prompt(
+            analysis_method, language
+        )
+        user_prompt = RiskAssessmentPrompts.build_ai_help_user_prompt(
+            image_paths,
+            additional_context=additional_context,
+            question_context=question_context,
+            supporting_documents=supporting_documents,
+            question_section_rendered=question_section_rendered,
+        )
+        return f"{system_prompt}\n{user_prompt}"
 
+    @staticmethod
     def merge_risk_assessments_ai_help(
-        self,
         question: str,
         control_list_name: str,
         keywords: Optional[str] = None,
@@ -478,7 +670,7 @@ Use the following JSON structure and replace the placeholders with your findings
         question_id: Optional[int] = None,
         analysis_method: str = "FINE_KINNEY",
     ) -> str:
-        payload = self.build_ai_help_prompt_payload(
+        payload = RiskAssessmentPrompts.build_ai_help_prompt_payload(
             question=question,
             control_list_name=control_list_name,
             keywords=keywords,
@@ -489,8 +681,8 @@ Use the following JSON structure and replace the placeholders with your findings
         )
         return payload["prompt"]
 
+    @staticmethod
     def build_ai_help_prompt_payload(
-        self,
         question: str,
         control_list_name: str,
         keywords: Optional[str] = None,
@@ -502,50 +694,111 @@ Use the following JSON structure and replace the placeholders with your findings
         """
         Helper that mirrors merge_risk_assessments_ai_help but also returns the structured
         media metadata so callers can supply actual image inputs to the LLM.
+        `system_prompt`/`user_prompt` hold the static and per-question halves of
+        `prompt` for callers that send them as separate (cacheable) messages.
         """
-        images, supporting_documents = self._split_uploaded_resources(uploaded_documents)
+        (
+            images,
+            supporting_documents,
+            image_urls,
+        ) = RiskAssessmentPrompts._split_uploaded_resources(uploaded_documents)
+
+        keywords = keywords.strip() if keywords else None
+        question_section = _render_question_context(
+            control_list_name, question, question_id, keywords
+        )
 
-        question_context: Dict[str, Any] = {
-            "Control list": control_list_name,
-            "Question": question,
-        }
-        if question_id is not None:
-            question_context["Question ID"] = question_id
-        if keywords and keywords.strip():
-            question_context["Keywords"] = keywords.strip()
-
-        additional_context_lines: List[str] = []
-        if keywords and keywords.strip():
-            additional_context_lines.append(
-                "Keywords provided by the user must be addressed explicitly in the findings."
-            )
-        if supporting_documents:
-            additional_context_lines.append(
-                "Supporting documents are listed below; cite them explicitly alongside relevant observations."
-            )
+        additional_context = _ADDITIONAL_CONTEXT[
+            (bool(keywords), bool(supporting_documents))
+        ]
 
-        additional_context = (
-            "\n".join(additional_context_lines) if additional_context_lines else None
+        system_prompt = RiskAssessmentPrompts.build_ai_help_system_prompt(
+            analysis_method, language
         )
-
-        prompt_text = self.merge_risk_assessments(
-            image_paths=images,
-            analysis_method=analysis_method,
-            language=language,
+        user_prompt = RiskAssessmentPrompts.build_ai_help_user_prompt(
+            images,
             additional_context=additional_context,
-            question_context=question_context,
             supporting_documents=supporting_documents,
+            question_section_rendered=question_section,
         )
 
-        image_urls = [
-            entry.get("url")
-            for entry in images
-            if isinstance(entry, dict) and entry.get("url")
-        ]
-
         return {
-            "prompt": prompt_text,
+            "prompt": f"{system_prompt}\n{user_prompt}",
+            "system_prompt": system_prompt,
+            "user_prompt": user_prompt,
             "image_resources": images,
             "supporting_documents": supporting_documents,
             "image_urls": image_urls,
         }
+
+
+@lru_cache(maxsize=1024)
+def _merge_image_only_prompt(
+    analysis_method: str, language: str, image_paths: Tuple[str, ...]
+) -> str:
+    system_prompt = RiskAssessmentPrompts.build_ai_help_system_prompt(
+        analysis_method, language
+    )
+    user_prompt = RiskAssessmentPrompts.build_ai_help_user_prompt(list(image_paths))
+    return f"{system_prompt}\n{user_prompt}"
+
+
+class _PromptSections(NamedTuple):
+    output_language: str
+    affected_people_options: str
+    method_instructions: str
+    method_label: Optional[str]  # None for the fallback method (uses the caller's name)
+    scoring_reference: str
+    json_template: str
+    system_prompt: Optional[str] = None  # fully rendered for known methods
+
+
+def _render_ai_help_system_prompt(sections: _PromptSections, method_label: str) -> str:
+    return _AI_HELP_SYSTEM_TEMPLATE.format_map(
+        {
+            "method_label": method_label,
+            "method_instructions": sections.method_instructions,
+            "scoring_reference": sections.scoring_reference,
+            "output_language": sections.output_language,
+            "affected_people_options": sections.affected_people_options,
+            "json_template": sections.json_template,
+        }
+    )
+
+
+# Sections of the AI help system prompt only depend on (method, language), so
+# they are rendered once at import, and known methods get the whole prompt baked
+# in; None is the fallback for unknown methods
+_PRECOMPUTED: Dict[Tuple[Optional[str], str], _PromptSections] = {}
+
+
+def _build_cache() -> None:
+    prompts = RiskAssessmentPrompts
+    for language_code in AFFECTED_PEOPLE_OPTIONS:
+        output_language = prompts._get_output_language_label(language_code)
+        affected_people_options = prompts._format_affected_people_options(language_code)
+        for method_key in (*METHOD_REQUIREMENTS, None):
+            (
+                method_instructions,
+                include_frequency,
+                method_label,
+                scoring_reference,
+            ) = prompts._get_method_instruction_block(method_key or "", output_language)
+            sections = _PromptSections(
+                output_language=output_language,
+                affected_people_options=affected_people_options,
+                method_instructions=method_instructions,
+                method_label=method_label if method_key else None,
+                scoring_reference=scoring_reference,
+                json_template=prompts._build_json_template(
+                    language_code, include_frequency
+                ),
+            )
+            if method_key:
+                sections = sections._replace(
+                    system_prompt=_render_ai_help_system_prompt(sections, method_label)
+                )
+            _PRECOMPUTED[(method_key, language_code)] = sections
+
+
+_build_cache()
@@ -1,38 +1,31 @@
 from __future__ import annotations
 
-from typing import Iterable, Sequence
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 
-def build_sql_generation_system_prompt(
-    *,
-    account_id: int,
-    usable_tables: Sequence[str],
-    db_schema_pretty: str,
-    formatted_templates: str,
-) -> str:
-    tables = ", ".join(usable_tables)
-    return f"""You are an expert PostgreSQL database analyst specializing in generating precise SQL queries for business intelligence and operational reporting.
+# Account-independent instructions come first so every SQL generation call
+# shares the same prefix for provider-side prompt caching; the per-account
+# values live only in the trailing CONTEXT block
+SQL_SYSTEM_STATIC = """You are an expert PostgreSQL database analyst specializing in generating precise SQL queries for business intelligence and operational reporting.
 
 CRITICAL SECURITY & DATA ACCESS RULES:
-1. MANDATORY: Every query MUST include account_id = {account_id} filter for data isolation
+1. MANDATORY: Every query MUST include the account_id filter (value given in CONTEXT below) for data isolation
 2. ANALYZE the database schema carefully to determine how to apply account_id filtering
-3. For tables WITH account_id column: Use direct filtering WHERE account_id = {account_id}
+3. For tables WITH account_id column: Use direct filtering WHERE account_id = <account_id>
 4. For tables WITHOUT account_id column: Find the relationship path to tables that have account_id and use JOINs
 5. Never return raw ID fields - always JOIN to get human-readable names (e.g., user.name, company.name)
 6. Use PostgreSQL-specific syntax and functions when needed
 
-AVAILABLE TABLES & KEY RELATIONSHIPS:
-Available tables: {tables}
-
 HOW TO ANALYZE SCHEMA FOR ACCOUNT_ID FILTERING:
 1. Check if the primary table in your query has an account_id column
-2. If YES: Add WHERE account_id = {account_id} directly
+2. If YES: Add WHERE account_id = <account_id> directly
 3. If NO: Look at the foreign key relationships to find a path to account_id
    - Most commonly through workplace_id → workplaces.account_id
    - Or through company_id → companies.account_id  
    - Or through user references → users.account_id
 4. Use appropriate JOINs to connect to tables with account_id
-5. Always ensure the final WHERE clause includes account_id = {account_id} filtering
+5. Always ensure the final WHERE clause includes account_id = <account_id> filtering
 
 BUSINESS CONTEXT MAPPING:
 - incident_report: Safety incidents, workplace accidents, near-misses
@@ -51,9 +44,6 @@ IMPORTANT SCHEMA DETAILS:
 - For date/time queries, consider created_at, updated_at fields where available
 - Use appropriate aggregate functions (COUNT, SUM, AVG) for statistical queries
 
-DATABASE SCHEMA (Please analyze this carefully):
-{db_schema_pretty}
-
 SCHEMA-BASED ACCOUNT_ID FILTERING EXAMPLES:
 
 STEP-BY-STEP ANALYSIS PROCESS:
@@ -65,14 +55,14 @@ STEP-BY-STEP ANALYSIS PROCESS:
 
 EXAMPLE 1 - Direct filtering (table HAS account_id):
 Schema shows companies.account_id exists → Direct filter
-SELECT * FROM companies WHERE account_id = {account_id}
+SELECT * FROM companies WHERE account_id = <account_id>
 
 EXAMPLE 2 - JOIN filtering (table LACKS account_id):
 Schema shows incident_report has workplace_id → workplaces has account_id
 SELECT ir.*, w.name as workplace_name 
 FROM incident_report ir 
 JOIN workplaces w ON ir.workplace_id = w.id 
-WHERE w.account_id = {account_id}
+WHERE w.account_id = <account_id>
 
 EXAMPLE 3 - Multiple path analysis:
 Schema shows incident_report has both workplace_id AND company_id
@@ -81,32 +71,106 @@ SELECT ir.*, c.name as company_name, w.name as workplace_name
 FROM incident_report ir
 JOIN workplaces w ON ir.workplace_id = w.id  
 JOIN companies c ON ir.company_id = c.id
-WHERE w.account_id = {account_id}
+WHERE w.account_id = <account_id>
 
 REMEMBER: Always analyze the provided schema to determine the correct filtering approach!
-
-EXAMPLE QUERY TEMPLATES:
-{formatted_templates}
+BEFORE writing the query, mentally trace through the schema to ensure proper account_id filtering approach.
 
 RESPONSE FORMAT: Return ONLY the SQL query - no explanations, no markdown formatting, no semicolons."""
 
 
-def build_sql_generation_prompt(question: str) -> str:
-    return f"""Business Question: {question}
+def build_sql_generation_context(
+    *,
+    account_id: int,
+    usable_tables: Sequence[str],
+    db_schema_pretty: str,
+    formatted_templates: str,
+) -> str:
+    """Dynamic tail of the SQL system prompt (tables, schema, templates, account)."""
+    return _render_sql_context(
+        account_id, tuple(usable_tables), db_schema_pretty, formatted_templates
+    )
+
+
+# Tables, schema and templates only change on template refresh, so the tail is
+# effectively per account and reused across that account's requests
+@lru_cache(maxsize=256)
+def _render_sql_context(
+    account_id: int,
+    usable_tables: Tuple[str, ...],
+    db_schema_pretty: str,
+    formatted_templates: str,
+) -> str:
+    return "".join(
+        (
+            "EXAMPLE QUERY TEMPLATES:\n",
+            formatted_templates,
+            "\n\nAVAILABLE TABLES:\n",
+            ", ".join(usable_tables),
+            "\n\nDATABASE SCHEMA (Please analyze this carefully):\n",
+            db_schema_pretty,
+            "\n\nCONTEXT:\naccount_id=",
+            str(account_id),
+        )
+    )
+
 
-ANALYSIS STEPS:
-1. First, analyze the provided database schema to understand table relationships
-2. Identify which tables are needed to answer the business question
-3. For each table, check if it has an account_id column in the schema
-4. If a table lacks account_id, trace its foreign key relationships to find the path to account_id
-5. Design the appropriate JOIN strategy to ensure account_id filtering
+def build_sql_generation_system_prompt(
+    *,
+    account_id: int,
+    usable_tables: Sequence[str],
+    db_schema_pretty: str,
+    formatted_templates: str,
+) -> str:
+    return "\n\n".join(
+        (
+            SQL_SYSTEM_STATIC,
+            build_sql_generation_context(
+                account_id=account_id,
+                usable_tables=usable_tables,
+                db_schema_pretty=db_schema_pretty,
+                formatted_templates=formatted_templates,
+            ),
+        )
+    )
 
-Generate a PostgreSQL query that:
-1. Answers the business question accurately  
-2. CRITICALLY IMPORTANT: Includes the mandatory account_id filter (analyze schema to determine how)
-3. Returns human-readable results (names instead of IDs)
-4. Uses schema-appropriate JOINs for account_id filtering
-5. Follows PostgreSQL best practices
+
+def build_sql_generation_messages(
+    *,
+    question: str,
+    account_id: int,
+    usable_tables: Sequence[str],
+    db_schema_pretty: str,
+    formatted_templates: str,
+) -> List[Dict[str, Any]]:
+    """
+    Chat messages for SQL generation; the static instructions are a separate
+    system block with a cache breakpoint so it is reused across accounts.
+    """
+    context = build_sql_generation_context(
+        account_id=account_id,
+        usable_tables=usable_tables,
+        db_schema_pretty=db_schema_pretty,
+        formatted_templates=formatted_templates,
+    )
+    return [
+        {
+            "role": "system",
+            "content": [
+                {
+                    "type": "text",
+                    "text": SQL_SYSTEM_STATIC,
+                    "cache_control": {"type": "ephemeral"},
+                },
+                {"type": "text", "text": context},
+            ],
+        },
+        {"role": "user", "content": build_sql_generation_prompt(question)},
+    ]
+
+
+def build_sql_generation_prompt(question: str) -> str:
+    return f"""Business Question: {question}
 
 Return the final output strictly as JSON with the following shape:
 {{
@@ -114,8 +178,6 @@ Return the final output strictly as JSON with the following shape:
   "reasoning": "<one sentence summary>"
 }}
 
-BEFORE writing the query, mentally trace through the schema to ensure proper account_id filtering approach.
-
 SQL Query:"""
 
 
@@ -146,35 +208,29 @@ SQL Sonucu: {result}
 Bu hesaba özel verileri kullanarak net bir yanıt ver. Eğer veri bulunamadıysa bunu açıkla."""
 
 
-def build_category_check_prompt(answer: str, result: str) -> str:
-    return (
-        "Analyze the following answer and SQL result. "
-        "Does the answer contain any category codes (like 'unsafe_sit') that should be "
-        "replaced with their proper names from the incident_report_categories table? "
-        "If yes, list all the category codes that need translation.\n\n"
-        f"Answer: {answer}\n"
-        f"SQL Result: {result}"
-    )
-
-
-def build_category_refine_prompt(answer: str, translations: str) -> str:
-    return (
-        "Refine the following answer by replacing category codes with their proper Turkish names. "
-        "Use the category translations provided below.\n\n"
-        f"Original Answer: {answer}\n"
-        f"Category Translations: {translations}\n\n"
-        "Important: Make sure to replace all category codes with their corresponding Turkish names (title_tr). "
-        "The answer should be natural and fluent in Turkish."
-    )
-
-
 def build_answer_verification_prompt(
     *,
     question: str,
     query: str,
     result: str,
     answer: str,
+    category_translations: Optional[str] = None,
 ) -> str:
+    """
+    Single-pass review: evaluates the answer and returns the improved version
+    (with category codes translated) in the same structured response.
+    """
+    category_block = (
+        "6. Does the answer contain category codes (like 'unsafe_sit')? Replace them "
+        "with their Turkish names (title_tr) from the category translations below.\n"
+        if category_translations
+        else ""
+    )
+    category_context = (
+        f"Category Translations: {category_translations}\n"
+        if category_translations
+        else ""
+    )
     return (
         "Evaluate the quality and accuracy of the following answer to the user's question. "
         "Check for the following issues:\n"
@@ -182,35 +238,18 @@ def build_answer_verification_prompt(
         "2. Are there any technical terms or codes that should be translated to more user-friendly language?\n"
         "3. Is the answer complete and accurate based on the SQL result?\n"
         "4. Is the answer presented in a clear and concise manner?\n"
-        "5. Does the answer properly reference the account-specific data?\n\n"
+        "5. Does the answer properly reference the account-specific data?\n"
+        f"{category_block}\n"
         f"User Question: {question}\n"
         f"SQL Query: {query}\n"
         f"SQL Result: {result}\n"
+        f"{category_context}"
         f"Current Answer: {answer}\n\n"
-        "Rate the answer on a scale of 1-10. If the rating is below 8, explain what needs to be improved."
-    )
-
-
-def build_answer_improvement_prompt(
-    *,
-    question: str,
-    query: str,
-    result: str,
-    answer: str,
-    evaluation: str,
-) -> str:
-    return (
-        "The current answer needs improvement. Please provide an improved answer to the user's question "
-        "based on the SQL result. Make sure to address all the issues identified in the evaluation.\n\n"
-        f"User Question: {question}\n"
-        f"SQL Query: {query}\n"
-        f"SQL Result: {result}\n"
-        f"Current Answer: {answer}\n"
-        f"Evaluation: {evaluation}\n\n"
-        "Provide an improved answer that is clear, accurate, and directly addresses the user's question. "
-        "Use natural language and avoid technical jargon unless necessary. "
-        "If the answer involves categories, make sure to use their proper names in Turkish. "
-        "Make sure the answer is specific to the account's data."
+        "Rate the answer on a scale of 1-10 and summarize your evaluation. "
+        "If the rating is below 8 or any issue above applies, set improved to true and put "
+        "an improved answer in final_answer: clear, accurate, in natural Turkish, specific "
+        "to the account's data and free of technical jargon unless necessary. "
+        "Otherwise set improved to false and repeat the current answer in final_answer."
     )
 
 
@@ -1,33 +1,26 @@
-import json
+import re
+import sys
+from functools import lru_cache
+from itertools import islice
 from typing import Any, Dict, List, Optional
 
+import orjson
 
-class SupportPrompts:
-    """Helper utilities for building/processing support assistant prompts."""
 
-    def build_support_prompt(
-        self,
-        *,
-        user_message: str,
-        improved_question: str,
-        agent_answer: str,
-        sources: List[str],
-        context_snapshot: Dict[str, Any],
-    ) -> str:
-        profile_block = self._format_user_profile(context_snapshot.get("user_profile"))
-        extra_block = self._format_generic_context(context_snapshot)
-        sources_block = ", ".join(sources) if sources else "casual"
+# Prompt'larda ve fallback yanıtlarda sürekli tekrar eden kısa metinler
+_NO_INFO = sys.intern("Bilgi bulunamadı")
+_NO_EXTRA_INFO = sys.intern("- Ek bilgi bulunamadı")
+_ESCALATE_ACTION = sys.intern("Canlı destek talebi oluştur")
+_INTENT_ERROR = sys.intern("error")
+_INVALID_FORMAT_REASON = sys.intern("LLM yanıtı beklenen formatta değil")
 
-        return f"""
+# Yanıt başındaki ```json / ``` ve sonundaki ``` çitleri tek geçişte temizlenir
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+# Sabit talimatlar prompt'un başında; böylece tüm destek çağrıları aynı prefix'i
+# paylaşır ve sağlayıcı tarafında önbelleklenebilir
+SUPPORT_PROMPT_STATIC = """
 Sen Risksoft platformunun teknik destek ajanısın.
-Kullanıcıya uygulanabilir çözüm ve yönlendirmeler sunmak için aşağıdaki bağlamı kullan:
-- Kullanıcı mesajı: {user_message}
-- Düzenlenmiş soru: {improved_question}
-- Ajan cevabı: {agent_answer}
-- Kullanılan kaynak türleri: {sources_block}
-- Kullanıcı profili: {profile_block}
-- Destek bağlamı:
-{extra_block}
 
 Kurallar:
 1. Yanıt tamamen Türkçe olmalı, sakin ve profesyonel bir ton kullan.
@@ -39,99 +32,169 @@ Kurallar:
 7. Yanıtın sonunda aşağıdaki JSON şemasını kullanarak rapor üret.
 
 ÇIKTI ŞEMASI (kesinlikle bu anahtarları kullan):
-{{
+{
   "answer": "<kullanıcıya verilecek tam yanıt>",
   "confidence": 0.0 - 1.0 arasında ondalık sayı,
   "needs_human_support": true veya false,
   "intent": "general" | "escalate" | "error" | "follow_up",
   "support_actions": ["<öneri 1>", "<öneri 2>"],
   "escalation_reason": "<destek gerekiyorsa kısa açıklama>"
-}}
+}
 
 ÖNEMLİ:
 - Eğer yanıt kesin değilse confidence 0.5'in altında olmalı ve needs_human_support true olmalı.
 - Teknik müdahale gerektiğini düşünüyorsan support_actions içinde "Canlı destek talebi oluştur" maddesini ekle.
 - JSON dışında ekstra metin üretme.
 
-Kullanıcı mesajı: {user_message}
 """
 
+# Dinamik bağlamın etrafındaki sabit parçalar; prompt bunların arasına
+# değerler yerleştirilerek tek join ile kurulur
+_CONTEXT_HEADER = (
+    SUPPORT_PROMPT_STATIC
+    + "\nKullanıcıya uygulanabilir çözüm ve yönlendirmeler sunmak için aşağıdaki bağlamı kullan:"
+    + "\n- Düzenlenmiş soru: "
+)
+_AGENT_ANSWER_LABEL = "\n- Ajan cevabı: "
+_SOURCES_LABEL = "\n- Kullanılan kaynak türleri: "
+_PROFILE_LABEL = "\n- Kullanıcı profili: "
+_SUPPORT_CONTEXT_LABEL = "\n- Destek bağlamı:\n"
+_USER_MESSAGE_LABEL = "\n\nKullanıcı mesajı: "
+
+
+def format_sources_block(sources: List[str]) -> str:
+    return ", ".join(sources) if sources else "casual"
+
+
+class SupportPrompts:
+    """Helper utilities for building/processing support assistant prompts."""
+
+    def build_support_prompt(
+        self,
+        *,
+        user_message: str,
+        improved_question: str,
+        agent_answer: str,
+        sources_block: str,
+        context_snapshot: Dict[str, Any],
+    ) -> str:
+        """`sources_block` comes from `format_sources_block`, computed once per conversation."""
+        profile_block = self._format_user_profile(context_snapshot.get("user_profile"))
+        extra_block = self._format_generic_context(context_snapshot)
+
+        return "".join(
+            (
+                _CONTEXT_HEADER,
+                improved_question,
+                _AGENT_ANSWER_LABEL,
+                agent_answer,
+                _SOURCES_LABEL,
+                sources_block,
+                _PROFILE_LABEL,
+                profile_block,
+                _SUPPORT_CONTEXT_LABEL,
+                extra_block,
+                _USER_MESSAGE_LABEL,
+                user_message,
+                "\n",
+            )
+        )
+
     def parse_support_response(self, response_text: str) -> Dict[str, Any]:
         """Parse LLM output into structured dict."""
-        cleaned = (
-            response_text.strip()
-            .removeprefix("```json")
-            .removeprefix("```")
-            .removesuffix("```")
-            .strip()
-        )
         try:
-            data = json.loads(cleaned)
-            if isinstance(data, dict):
-                return data
-        except json.JSONDecodeError:
-            pass
+            # Common case: the model returned bare JSON without fences
+            data = orjson.loads(response_text)
+        except orjson.JSONDecodeError:
+            try:
+                data = orjson.loads(_FENCE_RE.sub("", response_text))
+            except orjson.JSONDecodeError:
+                data = None
+        if isinstance(data, dict):
+            return data
 
         # Fallback if parsing fails
         return {
             "answer": response_text.strip(),
             "confidence": 0.3,
             "needs_human_support": True,
-            "intent": "error",
-            "support_actions": ["Canlı destek talebi oluştur"],
-            "escalation_reason": "LLM yanıtı beklenen formatta değil",
+            "intent": _INTENT_ERROR,
+            "support_actions": [_ESCALATE_ACTION],
+            "escalation_reason": _INVALID_FORMAT_REASON,
         }
 
     @staticmethod
     def _format_user_profile(profile: Optional[Dict[str, Any]]) -> str:
         if not profile:
-            return "Bilgi bulunamadı"
-
-        parts = []
-        full_name = " ".join(
-            filter(None, [profile.get("name"), profile.get("surname")])
-        ).strip()
-        if full_name:
-            parts.append(full_name)
-        if profile.get("task"):
-            parts.append(profile["task"])
-        if profile.get("account_id"):
-            parts.append(f"Account #{profile['account_id']}")
-        return " - ".join(parts) if parts else "Bilgi bulunamadı"
+            return _NO_INFO
+        return _format_user_profile_cached(
+            profile.get("name"),
+            profile.get("surname"),
+            profile.get("task"),
+            profile.get("account_id"),
+        )
 
     def _format_generic_context(self, context: Dict[str, Any]) -> str:
         if not context:
-            return "- Ek bilgi bulunamadı"
-
-        ignored_keys = {"user_profile"}
-        lines: List[str] = []
-        for key, value in context.items():
-            if key in ignored_keys or value in (None, [], {}):
-                continue
-
-            if isinstance(value, list):
-                preview_items = value[:3]
-                rendered = ", ".join(
-                    self._summarize_dict(item) if isinstance(item, dict) else str(item)
-                    for item in preview_items
-                )
-                more = "" if len(value) <= 3 else f" (+{len(value)-3} kayıt)"
-                lines.append(f"- {key}: {rendered}{more}")
-            elif isinstance(value, dict):
-                lines.append(f"- {key}: {self._summarize_dict(value)}")
-            else:
-                lines.append(f"- {key}: {value}")
-
-        return "\n".join(lines) if lines else "- Ek bilgi bulunamadı"
+            return _NO_EXTRA_INFO
+
+        lines = [
+            _RENDERERS.get(type(value), _render_scalar)(key, value)
+            for key, value in context.items()
+            if key != "user_profile" and value not in (None, [], {})
+        ]
+
+        return "\n".join(lines) if lines else _NO_EXTRA_INFO
 
     @staticmethod
     def _summarize_dict(payload: Dict[str, Any]) -> str:
         if not payload:
             return "—"
-        parts = []
-        for field in ("title", "name", "status", "id"):
-            if payload.get(field):
-                parts.append(str(payload[field]))
+        parts = [
+            str(payload[field])
+            for field in ("title", "name", "status", "id")
+            if field in payload and payload[field]
+        ]
         if not parts:
-            parts = [f"{k}: {v}" for k, v in list(payload.items())[:3]]
+            parts = [f"{k}: {v}" for k, v in islice(payload.items(), 3)]
         return " | ".join(parts)
+
+
+# Aynı kullanıcının profili destek oturumu boyunca her turda tekrar biçimlenir
+@lru_cache(maxsize=2048)
+def _format_user_profile_cached(
+    name: Optional[str],
+    surname: Optional[str],
+    task: Optional[str],
+    account_id: Optional[int],
+) -> str:
+    parts = []
+    full_name = ((name or "") + " " + (surname or "")).strip()
+    if full_name:
+        parts.append(full_name)
+    if task:
+        parts.append(task)
+    if account_id:
+        parts.append(f"Account #{account_id}")
+    return " - ".join(parts) if parts else _NO_INFO
+
+
+def _render_list(key: str, value: List[Any]) -> str:
+    rendered = ", ".join(
+        SupportPrompts._summarize_dict(item) if type(item) is dict else str(item)
+        for item in value[:3]
+    )
+    more = "" if len(value) <= 3 else f" (+{len(value)-3} kayıt)"
+    return f"- {key}: {rendered}{more}"
+
+
+def _render_dict(key: str, value: Dict[str, Any]) -> str:
+    return f"- {key}: {SupportPrompts._summarize_dict(value)}"
+
+
+def _render_scalar(key: str, value: Any) -> str:
+    return f"- {key}: {value}"
+
+
+# Bağlam değerleri JSON'dan geldiği için tipe göre tek sözlük araması yeterli
+_RENDERERS = {list: _render_list, dict: _render_dict}
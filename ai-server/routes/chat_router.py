@@ -1,4 +1,6 @@
-from fastapi import APIRouter, status
+from functools import lru_cache
+
+from fastapi import APIRouter, Depends, status
 from models.request_schemas import (
     ChatRequest,
     GenerateConversationTitleRequest,
@@ -10,35 +12,37 @@ from business.chatbot import Chatbot
 router = APIRouter(prefix="/chat", tags=["chat"])
 
 
+@lru_cache(maxsize=1)
 def get_chatbot_service() -> Chatbot:
+    """Shared service instance, created on first use."""
     return Chatbot()
 
 
 @router.post("/agent", status_code=status.HTTP_200_OK)
 async def interact_with_agent(
     request: ChatRequest,
+    service: Chatbot = Depends(get_chatbot_service),
 ):
     """Interact with agent"""
-    service = get_chatbot_service()
     return await service.interact_with_agent(request)
 
 
 @router.post("/agent/title", status_code=status.HTTP_200_OK)
 async def generate_conversation_title(
     request: GenerateConversationTitleRequest,
+    service: Chatbot = Depends(get_chatbot_service),
 ):
     """Generate conversation title"""
-    service = get_chatbot_service()
     return await service.generate_conversation_title(request.messages)
 
 
 @router.post("/support", status_code=status.HTTP_200_OK)
 async def support_chat(
     request: SupportChatRequest,
+    service: Chatbot = Depends(get_chatbot_service),
 ):
     """
     Handle support chat requests
     Returns AI response with confidence score and escalation flag
     """
-    service = get_chatbot_service()
     return await service.handle_support_chat(request)
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, status
+from functools import lru_cache
+
+from fastapi import APIRouter, Depends, status
 
 from services.semantic_search_service import SemanticSearchService
 from models.request_schemas import DocumentEmbeddingRequest
@@ -7,7 +9,9 @@ from models.respons_schemas import VectorStoreOperationResponse
 router = APIRouter(prefix="/indexing", tags=["indexing"])
 
 
+@lru_cache(maxsize=1)
 def get_semantic_search_service() -> SemanticSearchService:
+    """Shared service instance, created on first use."""
     return SemanticSearchService()
 
 
@@ -18,8 +22,8 @@ def get_semantic_search_service() -> SemanticSearchService:
 )
 async def process_documents(
     request: DocumentEmbeddingRequest,
+    service: SemanticSearchService = Depends(get_semantic_search_service),
 ):
-    service = get_semantic_search_service()
     return await service.create_vector_store(
         request.account_id, int(request.bucket_id), request.documents
     )
@@ -1,4 +1,7 @@
-from fastapi import APIRouter, status
+import logging
+from functools import lru_cache
+
+from fastapi import APIRouter, Depends, status
 
 from business.risk_service import RiskService
 from models.request_schemas import (
@@ -7,10 +10,14 @@ from models.request_schemas import (
 )
 from models.respons_schemas import RiskAssessmentResponse
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/risk", tags=["risk"])
 
 
+@lru_cache(maxsize=1)
 def get_risk_service() -> RiskService:
+    """Shared service instance, created on first use."""
     return RiskService()
 
 
@@ -21,6 +28,7 @@ def get_risk_service() -> RiskService:
 )
 async def analyze_risk_factors(
     request: RiskAssessmentGenerationRequest,
+    service: RiskService = Depends(get_risk_service),
 ):
     """
     Generate AI help analysis for a specific risk assessment question.
@@ -29,8 +37,8 @@ async def analyze_risk_factors(
     2. AI-powered response generation
     3. Markdown formatted response with recommendations
     """
-    service = get_risk_service()
-    print("request", request.uploaded_documents)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Uploaded documents: %s", request.uploaded_documents)
     return await service.generate_ai_help_analysis(
         question_id=request.question_id,
         question=request.question,
@@ -48,18 +56,19 @@ async def analyze_risk_factors(
 )
 async def generate_risk_assessment_question(
     request: RiskAssessmentQuestionGenerationRequest,
+    service: RiskService = Depends(get_risk_service),
 ):
     try:
-        # Debug: Log the request data
-        print(
-            f"Received request: title='{request.title}', description='{request.description}'"
-        )
-        print(
-            f"Title length: {len(request.title)}, Description length: {len(request.description)}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Received request: title=%r, description=%r (lengths %d/%d)",
+                request.title,
+                request.description,
+                len(request.title),
+                len(request.description),
+            )
 
-        service = get_risk_service()
         return await service.generate_risk_assessment_question(request)
     except Exception as e:
-        print(f"Error in generate_risk_assessment_question: {str(e)}")
+        logger.error("Error in generate_risk_assessment_question: %s", e)
         raise e
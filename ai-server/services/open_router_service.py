@@ -1,12 +1,36 @@
-import base64
+import asyncio
+import functools
 import logging
-import json
 import mimetypes
+import os
+import socket
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
-from typing import List, Dict, Optional, Union, Any, Sequence
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import httpx
+import orjson
 
-import requests
+try:
+    # SIMD base64 kernels; same API as the stdlib module
+    import pybase64 as _b64
+except ImportError:
+    import base64 as _b64
 from utils.helper import get_env
 from constants.config import (
     OPENROUTER_GPT_4O,
@@ -18,8 +42,95 @@ from utils.download import download_and_order_files
 from models.schemas import DocumentSource, AgentResponse, ModelUsage, ChatbotUsageLog
 from utils.s3Handler import S3Handler
 
+logger = logging.getLogger(__name__)
+
+# response_format may be given as a dict or as pre-serialized JSON bytes
+# (see the *_SCHEMA_JSON constants in models.schemas)
+ResponseFormat = Union[Dict[str, Any], bytes]
+
+# Base64 multimodal uploads are several MB; larger socket buffers than the OS
+# default cut the number of send/recv syscalls per request
+_SOCKET_OPTIONS = [
+    (socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20),
+    (socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20),
+]
+_CLIENT_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+# Load the MIME database once at import instead of lazily on the first request
+mimetypes.init()
+
+
+@functools.lru_cache(maxsize=256)
+def _guess_mime(suffix: str) -> Optional[str]:
+    return mimetypes.guess_type(f"x{suffix}")[0]
+
+
+# Magic numbers of the formats sent as multimodal files, most common first
+_MAGIC_PREFIXES = (
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF8", "image/gif"),
+    (b"ID3", "audio/mpeg"),
+    (b"OggS", "audio/ogg"),
+)
+_RIFF_TYPES = {b"WEBP": "image/webp", b"WAVE": "audio/wav"}
+
+
+def _sniff_mime(head: bytes) -> Optional[str]:
+    """Detect the MIME type from the first 16 bytes of a file, if recognised."""
+    for prefix, mime_type in _MAGIC_PREFIXES:
+        if head.startswith(prefix):
+            return mime_type
+    if head[4:8] == b"ftyp":
+        return "audio/mp4" if head[8:12] == b"M4A " else "video/mp4"
+    if head.startswith(b"RIFF"):
+        return _RIFF_TYPES.get(head[8:12])
+    return None
+
+
+def _image_block(url: str) -> Dict[str, Any]:
+    return {"type": "image_url", "image_url": {"url": url}}
+
+
+def _media_block(
+    block_type: str, payload: Dict[str, str], fallback: str
+) -> Dict[str, Any]:
+    """`input_audio` / `input_video` block from a prepared file payload."""
+    return {
+        "type": block_type,
+        block_type: {
+            "data": payload["data"],
+            "format": OpenRouterService._mime_to_format(
+                payload["mime_type"], fallback=fallback
+            ),
+        },
+    }
+
+
+# Files are base64-encoded in slices whose size is a multiple of 3, so every
+# slice encodes without padding and the pieces concatenate to the full encoding
+_B64_CHUNK_SIZE = 57 * 1024
+_HAS_FADVISE = hasattr(os, "posix_fadvise")
+
 
 class OpenRouterService:
+    # Shared across instances so every service reuses the same connection pools
+    _async_client: Optional[httpx.AsyncClient] = None
+    _client: Optional[httpx.Client] = None
+    _client_lock = threading.Lock()
+    # Bounded pool for sync calls (file reads + requests) awaited from async code
+    _executor: Optional[ThreadPoolExecutor] = None
+    # Separate pool for per-file read + encode jobs; they are submitted from
+    # tasks already running on `_executor`, so sharing it could deadlock
+    _file_executor: Optional[ThreadPoolExecutor] = None
+    _available_models = (
+        OPENROUTER_GPT_4O,
+        OPENROUTER_GPT_4O_MINI,
+        OPENROUTER_CLAUDE_3_5_SONNET,
+        OPENROUTER_GEMINI_FLASH,
+    )
+
     def __init__(self):
         """
         OpenRouter API servisi için istemci sınıfını başlatır
@@ -34,12 +145,98 @@ class OpenRouterService:
         if not self.api_key:
             raise ValueError("OPENROUTER_API_KEY environment variable is required")
 
+        # İstek başlıkları sabit; her istekte yeniden oluşturulmaz
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+
+    @classmethod
+    def _get_async_client(cls) -> httpx.AsyncClient:
+        """Return the process-wide async HTTP client, creating it on first use."""
+        if cls._async_client is None:
+            cls._async_client = httpx.AsyncClient(
+                timeout=120,
+                transport=httpx.AsyncHTTPTransport(
+                    http2=True, limits=_CLIENT_LIMITS, socket_options=_SOCKET_OPTIONS
+                ),
+            )
+        return cls._async_client
+
+    @classmethod
+    def _get_client(cls) -> httpx.Client:
+        """Return the process-wide sync HTTP client used from worker threads."""
+        if cls._client is None:
+            with cls._client_lock:
+                if cls._client is None:
+                    cls._client = httpx.Client(
+                        timeout=120,
+                        transport=httpx.HTTPTransport(
+                            http2=True,
+                            limits=_CLIENT_LIMITS,
+                            socket_options=_SOCKET_OPTIONS,
+                        ),
+                    )
+        return cls._client
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared HTTP clients; called on application shutdown."""
+        if cls._client is not None:
+            cls._client.close()
+            cls._client = None
+        if cls._async_client is not None:
+            await cls._async_client.aclose()
+            cls._async_client = None
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        """Return the process-wide executor for blocking calls, creating it on first use."""
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="llm")
+        return cls._executor
+
+    @classmethod
+    def _get_file_executor(cls) -> ThreadPoolExecutor:
+        """Return the process-wide pool for file payload preparation."""
+        if cls._file_executor is None:
+            cls._file_executor = ThreadPoolExecutor(
+                max_workers=8, thread_name_prefix="llm-file"
+            )
+        return cls._file_executor
+
     @staticmethod
     def _mime_to_format(mime_type: Optional[str], fallback: str = "bin") -> str:
         """Map MIME type to simple format extension."""
         if not mime_type:
             return fallback
-        return mime_type.split("/")[-1]
+        return mime_type.rpartition("/")[2]
+
+    @staticmethod
+    def _iter_file_chunks(path: Path) -> Iterator[bytes]:
+        with open(path, "rb") as fp:
+            if _HAS_FADVISE:
+                # Let the kernel read ahead the whole file while earlier
+                # chunks are being encoded
+                fd = fp.fileno()
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            while chunk := fp.read(_B64_CHUNK_SIZE):
+                yield chunk
+
+    @staticmethod
+    def _iter_buffer_chunks(data: Union[bytes, bytearray]) -> Iterator[memoryview]:
+        view = memoryview(data)
+        for start in range(0, len(view), _B64_CHUNK_SIZE):
+            yield view[start : start + _B64_CHUNK_SIZE]
+
+    @staticmethod
+    def _stream_b64_encode(chunks: Iterable[Union[bytes, memoryview]]) -> str:
+        """Base64-encode chunk by chunk so the raw file is never held whole in memory."""
+        encoded = bytearray()
+        for chunk in chunks:
+            encoded += _b64.b64encode(chunk)
+        return encoded.decode("ascii")
 
     def _prepare_file_payload(
         self,
@@ -55,11 +252,11 @@ class OpenRouterService:
         try:
             if isinstance(source, (str, Path)):
                 path = Path(source)
-                data_bytes = path.read_bytes()
+                chunks = self._iter_file_chunks(path)
                 name = path.name or f"{default_name_prefix}.bin"
-                mime_type = mimetypes.guess_type(path.name)[0] or default_mime
+                mime_type = _guess_mime(path.suffix.lower()) or default_mime
             elif isinstance(source, (bytes, bytearray)):
-                data_bytes = bytes(source)
+                chunks = self._iter_buffer_chunks(source)
                 mime_type = default_mime
                 name = f"{default_name_prefix}.bin"
             elif isinstance(source, dict):
@@ -72,29 +269,72 @@ class OpenRouterService:
                     or f"{default_name_prefix}.bin"
                 )
                 mime_type = source.get("mime_type") or default_mime
+                # The caller guarantees the data is already base64; pass it through
+                if source.get("is_base64") or source.get("encoding") == "base64":
+                    return {
+                        "name": name,
+                        "mime_type": mime_type,
+                        "data": (
+                            data
+                            if isinstance(data, str)
+                            else bytes(data).decode("ascii")
+                        ),
+                    }
                 if isinstance(data, str):
-                    if source.get("is_base64"):
-                        return {
-                            "name": name,
-                            "mime_type": mime_type,
-                            "data": data,
-                        }
-                    data_bytes = data.encode("utf-8")
+                    chunks = self._iter_buffer_chunks(data.encode("utf-8"))
                 else:
-                    data_bytes = bytes(data)
+                    chunks = self._iter_buffer_chunks(bytes(data))
             else:
                 raise TypeError("Unsupported file source type for multimodal payloads")
 
-            encoded = base64.b64encode(data_bytes).decode("utf-8")
+            # The content header wins over the declared type and the extension
+            first_chunk = next(chunks, b"")
+            mime_type = _sniff_mime(bytes(first_chunk[:16])) or mime_type
+
             return {
                 "name": name,
                 "mime_type": mime_type,
-                "data": encoded,
+                "data": self._stream_b64_encode(chain((first_chunk,), chunks)),
             }
         except Exception as exc:
-            logging.error(f"Failed to prepare file payload: {exc}")
+            logger.error("Failed to prepare file payload: %s", exc, exc_info=True)
             raise
 
+    def _prepare_file_payloads(
+        self, *groups: Tuple[Optional[Sequence[Any]], str, str]
+    ) -> List[List[Dict[str, str]]]:
+        """
+        (dosyalar, default_mime, isim öneki) gruplarındaki tüm dosyaları dosya
+        havuzunda paralel okuyup kodlar; her grup için girdi sırasıyla payload
+        listesi döner.
+        """
+        jobs = [(entries or (), mime, prefix) for entries, mime, prefix in groups]
+        if sum(len(entries) for entries, _, _ in jobs) <= 1:
+            return [
+                [
+                    self._prepare_file_payload(
+                        entry, default_mime=mime, default_name_prefix=prefix
+                    )
+                    for entry in entries
+                ]
+                for entries, mime, prefix in jobs
+            ]
+
+        executor = self._get_file_executor()
+        futures = [
+            [
+                executor.submit(
+                    self._prepare_file_payload,
+                    entry,
+                    default_mime=mime,
+                    default_name_prefix=prefix,
+                )
+                for entry in entries
+            ]
+            for entries, mime, prefix in jobs
+        ]
+        return [[future.result() for future in group] for group in futures]
+
     def _build_multimodal_content(
         self,
         *,
@@ -109,6 +349,7 @@ class OpenRouterService:
         video_files: Optional[
             Sequence[Union[str, Path, Dict[str, Any], bytes, bytearray]]
         ] = None,
+        already_encoded_files: Optional[Sequence[Dict[str, str]]] = None,
         extra_content: Optional[List[Dict[str, Any]]] = None,
     ) -> List[Dict[str, Any]]:
         """
@@ -116,67 +357,39 @@ class OpenRouterService:
         https://openrouter.ai/docs/features/multimodal/overview and the image specific
         guidance outlined in https://openrouter.ai/docs/features/multimodal/images
         (text first, then `image_url`/file entries, each image in its own block).
-        """
-        contents: List[Dict[str, Any]] = []
 
-        if text:
-            contents.append({"type": "text", "text": text})
+        `already_encoded_files` are `{name, mime_type, data}` payloads whose `data`
+        the caller guarantees to be base64; they are added as file blocks as-is.
+        """
+        contents: List[Dict[str, Any]] = (
+            [{"type": "text", "text": text}] if text else []
+        )
 
         if image_urls:
-            for url in image_urls:
-                if not url:
-                    continue
-                contents.append({"type": "image_url", "image_url": {"url": url}})
-
-        if pdf_files:
-            for entry in pdf_files:
-                payload = self._prepare_file_payload(
-                    entry,
-                    default_mime="application/pdf",
-                    default_name_prefix="document",
-                )
-                contents.append({"type": "file", "file": payload})
+            contents += [_image_block(url) for url in image_urls if url]
 
-        if audio_files:
-            for entry in audio_files:
-                payload = self._prepare_file_payload(
-                    entry,
-                    default_mime="audio/mpeg",
-                    default_name_prefix="audio",
-                )
-                contents.append(
-                    {
-                        "type": "input_audio",
-                        "input_audio": {
-                            "data": payload["data"],
-                            "format": self._mime_to_format(
-                                payload["mime_type"], fallback="mp3"
-                            ),
-                        },
-                    }
-                )
+        pdf_payloads, audio_payloads, video_payloads = self._prepare_file_payloads(
+            (pdf_files, "application/pdf", "document"),
+            (audio_files, "audio/mpeg", "audio"),
+            (video_files, "video/mp4", "video"),
+        )
 
-        if video_files:
-            for entry in video_files:
-                payload = self._prepare_file_payload(
-                    entry,
-                    default_mime="video/mp4",
-                    default_name_prefix="video",
-                )
-                contents.append(
-                    {
-                        "type": "input_video",
-                        "input_video": {
-                            "data": payload["data"],
-                            "format": self._mime_to_format(
-                                payload["mime_type"], fallback="mp4"
-                            ),
-                        },
-                    }
-                )
+        contents += [{"type": "file", "file": payload} for payload in pdf_payloads]
+
+        if already_encoded_files:
+            contents += [
+                {"type": "file", "file": payload} for payload in already_encoded_files
+            ]
+
+        contents += [
+            _media_block("input_audio", payload, "mp3") for payload in audio_payloads
+        ]
+        contents += [
+            _media_block("input_video", payload, "mp4") for payload in video_payloads
+        ]
 
         if extra_content:
-            contents.extend(extra_content)
+            contents += extra_content
 
         if not contents:
             raise ValueError(
@@ -185,13 +398,44 @@ class OpenRouterService:
 
         return contents
 
+    @staticmethod
+    def _build_request_body(
+        messages: List[Dict],
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[ResponseFormat] = None,
+        extra_params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """OpenRouter chat completion istek gövdesini oluşturur"""
+        data: Dict[str, Any] = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+        }
+
+        if max_tokens:
+            data["max_tokens"] = max_tokens
+
+        if response_format:
+            data["response_format"] = (
+                orjson.Fragment(response_format)
+                if isinstance(response_format, (bytes, bytearray))
+                else response_format
+            )
+
+        if extra_params:
+            data.update(extra_params)
+
+        return data
+
     def _make_request(
         self,
         messages: List[Dict],
         model: str = OPENROUTER_GPT_4O,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
-        response_format: Optional[Dict[str, Any]] = None,
+        response_format: Optional[ResponseFormat] = None,
         extra_params: Optional[Dict[str, Any]] = None,
     ) -> Dict:
         """
@@ -206,45 +450,134 @@ class OpenRouterService:
         Returns:
             API yanıtı
         """
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
+        data = self._build_request_body(
+            messages, model, temperature, max_tokens, response_format, extra_params
+        )
 
-        data: Dict[str, Any] = {
-            "model": model,
-            "messages": messages,
-            "temperature": temperature,
-        }
+        try:
+            start_time = time.time()
+            response = self._get_client().post(
+                self.base_url, headers=self._headers, content=orjson.dumps(data)
+            )
+            end_time = time.time()
+            response_time_ms = int((end_time - start_time) * 1000)
 
-        if max_tokens:
-            data["max_tokens"] = max_tokens
+            response.raise_for_status()
+            result = orjson.loads(response.content)
 
-        if response_format:
-            data["response_format"] = response_format
+            # Add response time to result
+            result["response_time_ms"] = response_time_ms
+            return result
 
-        if extra_params:
-            data.update(extra_params)
+        except httpx.HTTPError as e:
+            logger.error("OpenRouter API request failed: %s", e, exc_info=True)
+            raise Exception(f"OpenRouter API request failed: {str(e)}")
+
+    async def _amake_request(
+        self,
+        messages: List[Dict],
+        model: str = OPENROUTER_GPT_4O,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[ResponseFormat] = None,
+        extra_params: Optional[Dict[str, Any]] = None,
+    ) -> Dict:
+        """
+        `_make_request` ile aynı isteği paylaşılan async istemci üzerinden gönderir;
+        event loop bloklanmadan diğer çağrılarla eşzamanlı çalışabilir.
+        """
+        data = self._build_request_body(
+            messages, model, temperature, max_tokens, response_format, extra_params
+        )
 
         try:
             start_time = time.time()
-            response = requests.post(
-                self.base_url, headers=headers, data=json.dumps(data), timeout=120
+            response = await self._get_async_client().post(
+                self.base_url, headers=self._headers, content=orjson.dumps(data)
             )
             end_time = time.time()
             response_time_ms = int((end_time - start_time) * 1000)
 
             response.raise_for_status()
-            result = response.json()
+            result = orjson.loads(response.content)
 
-            # Add response time to result
             result["response_time_ms"] = response_time_ms
             return result
 
-        except requests.exceptions.RequestException as e:
-            logging.error(f"OpenRouter API request failed: {str(e)}")
+        except httpx.HTTPError as e:
+            logger.error("OpenRouter API request failed: %s", e, exc_info=True)
+            raise Exception(f"OpenRouter API request failed: {str(e)}")
+
+    async def _amake_stream_request(
+        self,
+        messages: List[Dict],
+        model: str = OPENROUTER_GPT_4O,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[ResponseFormat] = None,
+        extra_params: Optional[Dict[str, Any]] = None,
+        on_delta: Optional[Callable[[str], None]] = None,
+    ) -> Dict:
+        """
+        İsteği SSE (stream=True) ile gönderir ve her parçada o ana kadar biriken
+        metni `on_delta` ile bildirir. Dönen sözlük `_amake_request` ile aynı
+        yapıdadır, böylece `_to_agent_response` ile işlenebilir.
+        """
+        data = self._build_request_body(
+            messages, model, temperature, max_tokens, response_format, extra_params
+        )
+        data["stream"] = True
+
+        parts: List[str] = []
+        result: Dict[str, Any] = {}
+        finish_reason = ""
+
+        try:
+            start_time = time.time()
+            async with self._get_async_client().stream(
+                "POST",
+                self.base_url,
+                headers=self._headers,
+                content=orjson.dumps(data),
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    # OpenRouter interleaves ": OPENROUTER PROCESSING" comments
+                    if not line.startswith("data:"):
+                        continue
+                    event = line[5:].strip()
+                    if event == "[DONE]":
+                        break
+                    chunk = orjson.loads(event)
+                    if "error" in chunk:
+                        raise ValueError(f"OpenRouter stream error: {chunk['error']}")
+
+                    for key in ("id", "provider", "usage"):
+                        if chunk.get(key):
+                            result[key] = chunk[key]
+
+                    choice = (chunk.get("choices") or [{}])[0] or {}
+                    finish_reason = choice.get("finish_reason") or finish_reason
+                    delta = (choice.get("delta") or {}).get("content")
+                    if delta:
+                        parts.append(delta)
+                        if on_delta:
+                            on_delta("".join(parts))
+            end_time = time.time()
+
+        except httpx.HTTPError as e:
+            logger.error("OpenRouter API stream request failed: %s", e, exc_info=True)
             raise Exception(f"OpenRouter API request failed: {str(e)}")
 
+        result["choices"] = [
+            {
+                "message": {"role": "assistant", "content": "".join(parts)},
+                "finish_reason": finish_reason,
+            }
+        ]
+        result["response_time_ms"] = int((end_time - start_time) * 1000)
+        return result
+
     def chat_completion(
         self,
         messages: List[Dict],
@@ -252,7 +585,7 @@ class OpenRouterService:
         temperature: float = 0.7,
         usage_log: Optional[ChatbotUsageLog] = None,
         max_tokens: Optional[int] = None,
-        response_format: Optional[Dict[str, Any]] = None,
+        response_format: Optional[ResponseFormat] = None,
         extra_params: Optional[Dict[str, Any]] = None,
     ) -> AgentResponse:
         """
@@ -277,98 +610,260 @@ class OpenRouterService:
                 response_format,
                 extra_params,
             )
+            return self._to_agent_response(response_payload, model, usage_log)
+
+        except Exception as e:
+            return self._completion_error_response(e, model, response_payload)
+
+    async def achat_completion(
+        self,
+        messages: List[Dict],
+        model: str = OPENROUTER_GPT_4O,
+        temperature: float = 0.7,
+        usage_log: Optional[ChatbotUsageLog] = None,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[ResponseFormat] = None,
+        extra_params: Optional[Dict[str, Any]] = None,
+    ) -> AgentResponse:
+        """`chat_completion` metodunun async karşılığı"""
+        response_payload: Optional[Dict[str, Any]] = None
+        try:
+            response_payload = await self._amake_request(
+                messages,
+                model,
+                temperature,
+                max_tokens,
+                response_format,
+                extra_params,
+            )
+            return self._to_agent_response(response_payload, model, usage_log)
 
-            if not isinstance(response_payload, dict):
-                raise ValueError("OpenRouter API response is empty or malformed")
+        except Exception as e:
+            return self._completion_error_response(e, model, response_payload)
 
-            # Response metadata
-            response_id = response_payload.get("id", "")
-            provider = response_payload.get("provider", "")
+    async def gather_completions(
+        self,
+        calls: Sequence[Dict[str, Any]],
+        max_concurrency: int = 16,
+    ) -> AsyncIterator[Tuple[int, AgentResponse]]:
+        """
+        `achat_completion` kwargs listesini en fazla `max_concurrency` eşzamanlı
+        istekle çalıştırır; sonuçlar tamamlandıkça (index, yanıt) olarak döner,
+        böylece çağıran en yavaş isteği beklemeden işlemeye başlayabilir.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
 
-            # Choice data
-            choices = response_payload.get("choices")
-            if not isinstance(choices, list) or not choices:
-                raise ValueError(
-                    f"OpenRouter response missing 'choices': {response_payload}"
-                )
+        async def run(index: int, kwargs: Dict[str, Any]) -> Tuple[int, AgentResponse]:
+            async with semaphore:
+                return index, await self.achat_completion(**kwargs)
 
-            choice = choices[0] or {}
-            if not isinstance(choice, dict):
-                raise ValueError(
-                    f"OpenRouter response choice is not an object: {choice}"
-                )
+        tasks = [
+            asyncio.ensure_future(run(index, kwargs))
+            for index, kwargs in enumerate(calls)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # The caller may stop iterating early
+            for task in tasks:
+                task.cancel()
+
+    def chat_completions(self, calls: Sequence[Dict[str, Any]]) -> List[AgentResponse]:
+        """
+        `gather_completions`'ın sync karşılığı; `chat_completion` çağrılarını
+        paylaşılan executor'da paralel çalıştırır ve girdi sırasıyla döner.
+        """
+        return list(
+            self._get_executor().map(
+                lambda kwargs: self.chat_completion(**kwargs), calls
+            )
+        )
 
-            content = (choice.get("message") or {}).get("content", "")
-            finish_reason = choice.get("finish_reason", "")
-
-            # Usage data
-            usage = response_payload.get("usage") or {}
-            if not isinstance(usage, dict):
-                usage = {}
-            prompt_tokens = usage.get("prompt_tokens", 0)
-            completion_tokens = usage.get("completion_tokens", 0)
-            total_tokens = usage.get("total_tokens", 0)
-            response_time_ms = response_payload.get("response_time_ms", 0)
-
-            # Additional usage details
-            prompt_tokens_details = usage.get("prompt_tokens_details") or {}
-            completion_tokens_details = usage.get("completion_tokens_details") or {}
-            cached_tokens = prompt_tokens_details.get("cached_tokens", 0)
-            reasoning_tokens = completion_tokens_details.get("reasoning_tokens", 0)
-
-            # Log detailed usage if usage_log is provided
-            if usage_log:
-                usage_log.add_usage(
-                    model=f"{provider}/{model}" if provider else model,
-                    prompt_tokens=prompt_tokens,
-                    completion_tokens=completion_tokens,
-                    total_tokens=total_tokens,
-                    response_time_ms=response_time_ms,
-                )
+    async def astream_completion(
+        self,
+        messages: List[Dict],
+        model: str = OPENROUTER_GPT_4O,
+        temperature: float = 0.7,
+        usage_log: Optional[ChatbotUsageLog] = None,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[ResponseFormat] = None,
+        extra_params: Optional[Dict[str, Any]] = None,
+        on_delta: Optional[Callable[[str], None]] = None,
+    ) -> AgentResponse:
+        """
+        `achat_completion` ile aynı sonucu döndürür ancak yanıtı stream ederek
+        çağıranın tamamlanmadan önce kısmi çıktıya tepki vermesine izin verir.
+        """
+        response_payload: Optional[Dict[str, Any]] = None
+        try:
+            response_payload = await self._amake_stream_request(
+                messages,
+                model,
+                temperature,
+                max_tokens,
+                response_format,
+                extra_params,
+                on_delta,
+            )
+            return self._to_agent_response(response_payload, model, usage_log)
 
-            # Log additional metadata
-            logging.info(
-                f"OpenRouter Response - ID: {response_id}, Provider: {provider}, "
-                f"Finish Reason: {finish_reason}, Cached Tokens: {cached_tokens}, "
-                f"Reasoning Tokens: {reasoning_tokens}"
+        except Exception as e:
+            return self._completion_error_response(e, model, response_payload)
+
+    @staticmethod
+    def _to_agent_response(
+        response_payload: Any,
+        model: str,
+        usage_log: Optional[ChatbotUsageLog],
+    ) -> AgentResponse:
+        """Ham OpenRouter yanıtını doğrulayıp AgentResponse objesine dönüştürür"""
+        if not isinstance(response_payload, dict):
+            raise ValueError("OpenRouter API response is empty or malformed")
+
+        # Response metadata
+        response_id = response_payload.get("id", "")
+        provider = response_payload.get("provider", "")
+
+        # Choice data
+        choices = response_payload.get("choices")
+        if not isinstance(choices, list) or not choices:
+            raise ValueError(
+                f"OpenRouter response missing 'choices': {response_payload}"
             )
 
-            return AgentResponse(
-                content=content,
+        choice = choices[0] or {}
+        if not isinstance(choice, dict):
+            raise ValueError(f"OpenRouter response choice is not an object: {choice}")
+
+        content = (choice.get("message") or {}).get("content", "")
+        finish_reason = choice.get("finish_reason", "")
+
+        # Usage data
+        usage = response_payload.get("usage") or {}
+        if not isinstance(usage, dict):
+            usage = {}
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+        total_tokens = usage.get("total_tokens", 0)
+        response_time_ms = response_payload.get("response_time_ms", 0)
+
+        # Additional usage details
+        prompt_tokens_details = usage.get("prompt_tokens_details") or {}
+        completion_tokens_details = usage.get("completion_tokens_details") or {}
+        cached_tokens = prompt_tokens_details.get("cached_tokens", 0)
+        reasoning_tokens = completion_tokens_details.get("reasoning_tokens", 0)
+
+        # Log detailed usage if usage_log is provided
+        if usage_log:
+            usage_log.add_usage(
+                model=f"{provider}/{model}" if provider else model,
                 prompt_tokens=prompt_tokens,
                 completion_tokens=completion_tokens,
-                input_tokens=prompt_tokens,
-                output_tokens=completion_tokens,
-                cost=0.0,
-                model=f"{provider}/{model}" if provider else model,
+                total_tokens=total_tokens,
                 response_time_ms=response_time_ms,
             )
 
-        except Exception as e:
-            logging.error(
-                f"Chat completion failed: {str(e)} | response={response_payload}"
-            )
-            return AgentResponse(
-                content=f"Bir hata oluştu: {str(e)}",
-                prompt_tokens=0,
-                completion_tokens=0,
-                input_tokens=0,
-                output_tokens=0,
-                cost=0.0,
-                model=model,
-                response_time_ms=0,
-            )
+        # Log additional metadata
+        logger.info(
+            "OpenRouter Response - ID: %s, Provider: %s, Finish Reason: %s, "
+            "Cached Tokens: %s, Reasoning Tokens: %s",
+            response_id,
+            provider,
+            finish_reason,
+            cached_tokens,
+            reasoning_tokens,
+        )
+
+        return AgentResponse(
+            content=content,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            input_tokens=prompt_tokens,
+            output_tokens=completion_tokens,
+            cost=0.0,
+            model=f"{provider}/{model}" if provider else model,
+            response_time_ms=response_time_ms,
+        )
+
+    @staticmethod
+    def _completion_error_response(
+        error: Exception, model: str, response_payload: Optional[Dict[str, Any]]
+    ) -> AgentResponse:
+        """Başarısız completion çağrıları için tutarlı bir hata yanıtı döndürür"""
+        logger.error(
+            "Chat completion failed: %s | response=%s",
+            error,
+            response_payload,
+            exc_info=True,
+        )
+        return AgentResponse(
+            content=f"Bir hata oluştu: {str(error)}",
+            prompt_tokens=0,
+            completion_tokens=0,
+            input_tokens=0,
+            output_tokens=0,
+            cost=0.0,
+            model=model,
+            response_time_ms=0,
+        )
+
+    @staticmethod
+    def _build_system_message(
+        system_message: str, cache: bool = False
+    ) -> Dict[str, Any]:
+        """Sistem mesajını oluşturur; `cache` ile prompt cache breakpoint'i eklenir"""
+        if not cache:
+            return {"role": "system", "content": system_message}
+        return {
+            "role": "system",
+            "content": [
+                {
+                    "type": "text",
+                    "text": system_message,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+        }
+
+    @classmethod
+    def _build_text_messages(
+        cls, prompt: str, system_message: Optional[str] = None, cache: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Tek prompt ve opsiyonel sistem mesajından chat mesajlarını oluşturur"""
+        messages: List[Dict[str, Any]] = []
+
+        if system_message:
+            messages.append(cls._build_system_message(system_message, cache))
+
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    @staticmethod
+    def _with_prompt_cache(
+        extra_params: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Request options that keep cacheable prompt prefixes byte-identical;
+        OpenRouter's default transforms may rewrite the prompt and break reuse.
+        """
+        params: Dict[str, Any] = {"transforms": []}
+        if extra_params:
+            params.update(extra_params)
+        return params
 
     def generate_text(
         self,
-        prompt: str,
+        prompt: Optional[str] = None,
         model: str = OPENROUTER_GPT_4O,
         temperature: float = 0.7,
         system_message: Optional[str] = None,
         usage_log: Optional[ChatbotUsageLog] = None,
         max_tokens: Optional[int] = None,
-        response_format: Optional[Dict[str, Any]] = None,
+        response_format: Optional[ResponseFormat] = None,
         extra_params: Optional[Dict[str, Any]] = None,
+        messages: Optional[List[Dict[str, Any]]] = None,
+        cache: bool = False,
     ) -> AgentResponse:
         """
         Tek bir prompt ile metin üretir
@@ -379,25 +874,67 @@ class OpenRouterService:
             temperature: Yaratıcılık seviyesi
             system_message: Sistem mesajı (opsiyonel)
             usage_log: Kullanım logları için
+            messages: Hazır mesaj listesi (verilirse prompt/system_message yerine kullanılır)
+            cache: Sistem mesajı ve `cache_control` işaretli prefix'lerin sağlayıcıda önbelleklenmesi için
 
         Returns:
             AgentResponse objesi
         """
-        messages = []
-
-        if system_message:
-            messages.append({"role": "system", "content": system_message})
-
-        messages.append({"role": "user", "content": prompt})
-
         return self.chat_completion(
-            messages,
+            messages
+            or self._build_text_messages(prompt or "", system_message, cache),
             model,
             temperature,
             usage_log,
             max_tokens=max_tokens,
             response_format=response_format,
-            extra_params=extra_params,
+            extra_params=(
+                self._with_prompt_cache(extra_params) if cache else extra_params
+            ),
+        )
+
+    async def agenerate_text(
+        self,
+        prompt: Optional[str] = None,
+        model: str = OPENROUTER_GPT_4O,
+        temperature: float = 0.7,
+        system_message: Optional[str] = None,
+        usage_log: Optional[ChatbotUsageLog] = None,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[ResponseFormat] = None,
+        extra_params: Optional[Dict[str, Any]] = None,
+        messages: Optional[List[Dict[str, Any]]] = None,
+        cache: bool = False,
+        on_delta: Optional[Callable[[str], None]] = None,
+    ) -> AgentResponse:
+        """
+        `generate_text` metodunun async karşılığı; async endpoint'lerden
+        event loop'u bloklamadan çağrılabilir. `on_delta` verilirse yanıt
+        stream edilir ve biriken metin her parçada callback'e iletilir.
+        """
+        chat_messages = messages or self._build_text_messages(
+            prompt or "", system_message, cache
+        )
+        params = self._with_prompt_cache(extra_params) if cache else extra_params
+        if on_delta is not None:
+            return await self.astream_completion(
+                chat_messages,
+                model,
+                temperature,
+                usage_log,
+                max_tokens=max_tokens,
+                response_format=response_format,
+                extra_params=params,
+                on_delta=on_delta,
+            )
+        return await self.achat_completion(
+            chat_messages,
+            model,
+            temperature,
+            usage_log,
+            max_tokens=max_tokens,
+            response_format=response_format,
+            extra_params=params,
         )
 
     def multimodal_completion(
@@ -414,13 +951,14 @@ class OpenRouterService:
         video_files: Optional[
             Sequence[Union[str, Path, Dict[str, Any], bytes, bytearray]]
         ] = None,
+        already_encoded_files: Optional[Sequence[Dict[str, str]]] = None,
         extra_content: Optional[List[Dict[str, Any]]] = None,
         system_message: Optional[str] = None,
         model: str = OPENROUTER_GPT_4O,
         temperature: float = 0.7,
         usage_log: Optional[ChatbotUsageLog] = None,
         max_tokens: Optional[int] = None,
-        response_format: Optional[Dict[str, Any]] = None,
+        response_format: Optional[ResponseFormat] = None,
         extra_params: Optional[Dict[str, Any]] = None,
     ) -> AgentResponse:
         """
@@ -434,6 +972,7 @@ class OpenRouterService:
             pdf_files=pdf_files,
             audio_files=audio_files,
             video_files=video_files,
+            already_encoded_files=already_encoded_files,
             extra_content=extra_content,
         )
 
@@ -452,6 +991,68 @@ class OpenRouterService:
             extra_params=extra_params,
         )
 
+    async def amultimodal_completion(
+        self,
+        *,
+        text: Optional[str] = None,
+        image_urls: Optional[Sequence[str]] = None,
+        pdf_files: Optional[
+            Sequence[Union[str, Path, Dict[str, Any], bytes, bytearray]]
+        ] = None,
+        audio_files: Optional[
+            Sequence[Union[str, Path, Dict[str, Any], bytes, bytearray]]
+        ] = None,
+        video_files: Optional[
+            Sequence[Union[str, Path, Dict[str, Any], bytes, bytearray]]
+        ] = None,
+        already_encoded_files: Optional[Sequence[Dict[str, str]]] = None,
+        extra_content: Optional[List[Dict[str, Any]]] = None,
+        system_message: Optional[str] = None,
+        model: str = OPENROUTER_GPT_4O,
+        temperature: float = 0.7,
+        usage_log: Optional[ChatbotUsageLog] = None,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[ResponseFormat] = None,
+        extra_params: Optional[Dict[str, Any]] = None,
+        cache: bool = False,
+    ) -> AgentResponse:
+        """
+        `multimodal_completion` metodunun async karşılığı. Dosya okuma ve base64
+        kodlama bloklayıcı olduğundan içerik executor üzerinde hazırlanır, istek
+        ise paylaşılan async istemci ile gönderilir. `cache` ile sistem mesajı
+        sağlayıcı tarafında önbelleklenebilir prefix olarak işaretlenir.
+        """
+        content_blocks = await asyncio.get_running_loop().run_in_executor(
+            self._get_executor(),
+            functools.partial(
+                self._build_multimodal_content,
+                text=text,
+                image_urls=image_urls,
+                pdf_files=pdf_files,
+                audio_files=audio_files,
+                video_files=video_files,
+                already_encoded_files=already_encoded_files,
+                extra_content=extra_content,
+            ),
+        )
+
+        messages: List[Dict[str, Any]] = []
+        if system_message:
+            messages.append(self._build_system_message(system_message, cache))
+        messages.append({"role": "user", "content": content_blocks})
+
+        return await self.achat_completion(
+            messages,
+            model,
+            temperature,
+            usage_log,
+            max_tokens=max_tokens,
+            response_format=response_format,
+            extra_params=(
+                self._with_prompt_cache(extra_params) if cache else extra_params
+            ),
+        )
+
     def image_to_text(
         self,
         image_url: Union[str, List[str]],
@@ -488,7 +1089,7 @@ class OpenRouterService:
             )
 
         except Exception as e:
-            logging.error(f"Image to text failed: {str(e)}")
+            logger.error("Image to text failed: %s", e, exc_info=True)
             return AgentResponse(
                 content=f"Görsel analizi sırasında hata oluştu: {str(e)}",
                 prompt_tokens=0,
@@ -529,7 +1130,7 @@ class OpenRouterService:
             )
 
         except Exception as e:
-            logging.error(f"Error in create_merged_text_file: {e}")
+            logger.error("Error in create_merged_text_file: %s", e, exc_info=True)
             return False
 
     def chat_completion_detailed(
@@ -539,7 +1140,7 @@ class OpenRouterService:
         temperature: float = 0.7,
         usage_log: Optional[ChatbotUsageLog] = None,
         max_tokens: Optional[int] = None,
-        response_format: Optional[Dict[str, Any]] = None,
+        response_format: Optional[ResponseFormat] = None,
         extra_params: Optional[Dict[str, Any]] = None,
     ) -> Dict:
         """
@@ -579,7 +1180,7 @@ class OpenRouterService:
             return response
 
         except Exception as e:
-            logging.error(f"Detailed chat completion failed: {str(e)}")
+            logger.error("Detailed chat completion failed: %s", e, exc_info=True)
             return {
                 "error": str(e),
                 "choices": [{"message": {"content": f"Bir hata oluştu: {str(e)}"}}],
@@ -593,12 +1194,7 @@ class OpenRouterService:
         Returns:
             Model adları listesi
         """
-        return [
-            OPENROUTER_GPT_4O,
-            OPENROUTER_GPT_4O_MINI,
-            OPENROUTER_CLAUDE_3_5_SONNET,
-            OPENROUTER_GEMINI_FLASH,
-        ]
+        return list(self._available_models)
 
     def get_response_metadata(self, response: Dict) -> Dict:
         """
@@ -20,8 +20,8 @@ from models.schemas import (
     DocumentSource,
     DocumentQAResponse,
     DocumentAnalysisResponse,
-    DOCUMENT_QA_RESPONSE_SCHEMA,
-    DOCUMENT_ANALYSIS_RESPONSE_SCHEMA,
+    DOCUMENT_QA_RESPONSE_SCHEMA_JSON,
+    DOCUMENT_ANALYSIS_RESPONSE_SCHEMA_JSON,
 )
 from prompts.semantic_prompts import (
     build_document_qa_system_prompt,
@@ -102,7 +102,7 @@ class SemanticSearchService:
 
             for document in documents:
                 file_name = os.path.basename(document.path)
-                file_name_without_extension = file_name.split(".")[0]
+                file_name_without_extension = file_name.partition(".")[0]
                 raw_data_path = (
                     f"{account_id}-{bucket_id}/vector_store/raw_data/"
                     f"{file_name_without_extension}.json"
@@ -232,13 +232,13 @@ class SemanticSearchService:
             system_message = build_document_qa_system_prompt()
             prompt = build_document_qa_prompt(question, context)
 
-            response_obj = self.openrouter_service.generate_text(
+            response_obj = await self.openrouter_service.agenerate_text(
                 prompt=prompt,
                 model=OPENROUTER_GEMINI_FLASH,
                 temperature=0.2,
                 system_message=system_message,
                 usage_log=usage_log,
-                response_format=DOCUMENT_QA_RESPONSE_SCHEMA,
+                response_format=DOCUMENT_QA_RESPONSE_SCHEMA_JSON,
             )
 
             try:
@@ -328,13 +328,13 @@ class SemanticSearchService:
             system_message = build_document_analysis_system_prompt()
             prompt = build_document_analysis_prompt(question, context)
 
-            response_obj = self.openrouter_service.generate_text(
+            response_obj = await self.openrouter_service.agenerate_text(
                 prompt=prompt,
                 model=model,
                 temperature=temperature,
                 system_message=system_message,
                 usage_log=usage_log,
-                response_format=DOCUMENT_ANALYSIS_RESPONSE_SCHEMA,
+                response_format=DOCUMENT_ANALYSIS_RESPONSE_SCHEMA_JSON,
             )
 
             try:
@@ -1,4 +1,10 @@
 import asyncio
+import functools
+import hashlib
+import re
+import threading
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Tuple
 
 # Güncel LangChain modüllerine göre importlar:
@@ -15,7 +21,8 @@ from constants.config import (
 from langchain import hub
 from constants.env_variables import OPENAI_API_KEY
 from services.open_router_service import OpenRouterService
-from core.database import database_engine, db_session, get_database_uri
+from core.database import db_session, get_database_uri
+from sqlalchemy import select
 import logging
 from operator import itemgetter
 
@@ -29,17 +36,15 @@ from models.schemas import (
     ChatbotUsageLog,
     ChatbotSqlTemplate,
     SQLQueryResponse,
-    SQL_QUERY_RESPONSE_SCHEMA,
+    SQL_QUERY_RESPONSE_SCHEMA_JSON,
+    AnswerReviewResponse,
+    ANSWER_REVIEW_RESPONSE_SCHEMA_JSON,
 )
 from prompts.sql_prompts import (
-    build_sql_generation_system_prompt,
-    build_sql_generation_prompt,
+    build_sql_generation_messages,
     SQL_ANSWER_SYSTEM_MESSAGE,
     build_sql_answer_prompt,
-    build_category_check_prompt,
-    build_category_refine_prompt,
     build_answer_verification_prompt,
-    build_answer_improvement_prompt,
     ADVANCED_SQL_SYSTEM_MESSAGE,
     build_advanced_sql_prompt,
     build_visualization_prompt,
@@ -49,6 +54,84 @@ import time
 import json
 
 
+# The langchain SQL tooling and the SQL agent's LLM calls are synchronous;
+# they run on this bounded pool so the event loop stays free.
+_SQL_AGENT_EXECUTOR = ThreadPoolExecutor(max_workers=32, thread_name_prefix="sql-agent")
+
+_DB_SCHEMA_PATH = "constants/db_schema.json"
+# Şemadaki sürümlü tablolar (ör. operational_audit_report_v1) include_tables'ta
+# soneksiz geçiyor
+_TABLE_VERSION_SUFFIX_RE = re.compile(r"_v\d+$")
+
+
+@functools.lru_cache(maxsize=1)
+def _load_db_schema() -> Dict:
+    with open(_DB_SCHEMA_PATH) as schema_file:
+        return json.load(schema_file)
+
+
+@functools.lru_cache(maxsize=32)
+def trimmed_db_schema(usable_tables: frozenset) -> str:
+    """
+    SQL prompt'u için şemayı kullanılabilir tablolar ve FK ile bağlandıkları
+    üst tablolarla sınırlar; sonuç boşluksuz JSON olarak önbelleklenir.
+    """
+    schema = _load_db_schema()
+    selected = [
+        table
+        for table in schema["tables"]
+        if table["name"] in usable_tables
+        or _TABLE_VERSION_SUFFIX_RE.sub("", table["name"]) in usable_tables
+    ]
+    if not selected:
+        selected = schema["tables"]
+
+    keep = {table["name"] for table in selected}
+    keep.update(
+        column["references"]
+        for table in selected
+        for column in table["columns"]
+        if column.get("references")
+    )
+    trimmed = {
+        "tables": [table for table in schema["tables"] if table["name"] in keep],
+        "relationships": [
+            rel
+            for rel in schema["relationships"]
+            if rel["fromTable"] in keep and rel["toTable"] in keep
+        ],
+    }
+    return json.dumps(trimmed, ensure_ascii=False, separators=(",", ":"))
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# account_id = 42 / w.account_id = '42' karşılaştırmaları
+_ACCOUNT_FILTER_RE = re.compile(r"\baccount_id\s*=\s*'?(\d+)'?", re.IGNORECASE)
+# write_query hata durumunda bu sabit sorguyu üretir
+_QUERY_ERROR_PREFIX = "SELECT 'Error generating query"
+
+
+def _normalize_question(question: str) -> str:
+    """Büyük/küçük harf, boşluk ve sondaki noktalama farklarını yok sayar."""
+    return _WHITESPACE_RE.sub(" ", question.casefold()).strip().rstrip("?.!")
+
+
+def _result_digest(result: object) -> str:
+    return hashlib.sha256(str(result).encode("utf-8")).hexdigest()
+
+
+def _check_account_scope(query: str, account_id: int) -> None:
+    """
+    Prompt account_id'yi yalnızca CONTEXT'te verdiğinden, sorgunun istekteki
+    hesaba filtrelendiğini çalıştırmadan önce sunucu tarafında doğrular.
+    """
+    if "<account_id>" in query.lower():
+        raise ValueError("SQL query still contains the <account_id> placeholder")
+    filtered = {int(value) for value in _ACCOUNT_FILTER_RE.findall(query)}
+    if filtered != {int(account_id)}:
+        raise ValueError(f"SQL query is not scoped to account_id={account_id}")
+
+
 class QueryOutput(TypedDict):
     """Generated SQL query."""
 
@@ -65,6 +148,21 @@ class SQLQueryAgentService:
     - Hesap bazlı veri erişimi ve güvenliği
     """
 
+    # Template'ler nadiren değişir; instance'lar arasında paylaşılır ve periyodik
+    # olarak yenilenir. Her yüklemede versiyon artar, böylece türetilmiş
+    # formatlar (bkz. Chatbot._format_sql_templates) önbellekten kullanılabilir.
+    TEMPLATE_REFRESH_SECONDS = 300
+    _shared_templates: List[Tuple[str, str, Optional[str]]] = []
+    _templates_version: int = 0
+    _templates_loaded_at: float = 0.0
+    # write_query'nin few-shot bölümü; her yüklemede bir kez birleştirilir
+    _formatted_templates: str = ""
+    # (akış, account_id, normalize soru, ...) -> (sql, sonuç özeti, cevap).
+    # Kayıt, saklanan SQL yeniden çalıştırılıp sonuç özeti tuttuğunda
+    # kullanılır; veri değiştiyse cevap aynı SQL ile yeniden üretilir
+    _answer_cache: TTLCache = TTLCache(maxsize=2048, ttl=600)
+    _answer_cache_lock = threading.Lock()
+
     def __init__(self):
         """Database bağlantısı ve LLM kurulumu ile SQL Agent servisini başlatır."""
         self._initialize_database()
@@ -90,15 +188,42 @@ class SQLQueryAgentService:
             ],
             sample_rows_in_table_info=3,
         )
-        self.db_session = db_session()
 
     def _initialize_chatbot_sql_templates(self) -> None:
-        """Chatbot SQL query templates'ını başlatır."""
-        self.chatbot_sql_templates = self.db_session.query(
-            ChatbotSqlTemplate.input_text,
-            ChatbotSqlTemplate.query,
-            ChatbotSqlTemplate.description,
-        ).all()
+        """Chatbot SQL query templates'ını paylaşılan önbellekten bağlar."""
+        self.chatbot_sql_templates = SQLQueryAgentService._shared_templates
+        self.chatbot_sql_templates_version = SQLQueryAgentService._templates_version
+        self.chatbot_sql_templates_text = SQLQueryAgentService._formatted_templates
+
+    async def _ensure_chatbot_sql_templates(self) -> None:
+        """Template'leri gerekirse async session ile (yeniden) yükler."""
+        cls = SQLQueryAgentService
+        is_fresh = (
+            cls._templates_version
+            and time.time() - cls._templates_loaded_at < cls.TEMPLATE_REFRESH_SECONDS
+        )
+        if not is_fresh:
+            try:
+                result = await db_session().execute(
+                    select(
+                        ChatbotSqlTemplate.input_text,
+                        ChatbotSqlTemplate.query,
+                        ChatbotSqlTemplate.description,
+                    )
+                )
+                cls._shared_templates = [tuple(row) for row in result.all()]
+                cls._formatted_templates = "\n\n".join(
+                    f"Input: {input_text}\nQuery: {query}\nDescription: {description}"
+                    for input_text, query, description in cls._shared_templates
+                )
+            finally:
+                # May run in a prefetch task outside the request task, so the
+                # session is released here rather than by the middleware
+                await db_session.remove()
+            cls._templates_version += 1
+            cls._templates_loaded_at = time.time()
+
+        self._initialize_chatbot_sql_templates()
 
     def _initialize_openrouter(self) -> None:
         """OpenRouter servisini başlatır."""
@@ -107,35 +232,26 @@ class SQLQueryAgentService:
     def write_query(self, state: State):
         """Generate SQL query to fetch information using OpenRouter."""
         try:
-            # Template'leri formatla
-            formatted_templates = "\n\n".join(
-                [
-                    f"Input: {template[0]}\nQuery: {template[1]}\nDescription: {template[2]}"
-                    for template in self.chatbot_sql_templates
-                ]
-            )
-
-            db_schema = json.loads(open("constants/db_schema.json").read())
-            db_schema_pretty = json.dumps(db_schema, indent=2)
-            system_message = build_sql_generation_system_prompt(
+            usable_tables = self.db.get_usable_table_names()
+            # Statik talimatlar önbelleklenebilir prefix, hesap bilgisi en sonda
+            messages = build_sql_generation_messages(
+                question=state["question"],
                 account_id=state["account_id"],
-                usable_tables=list(self.db.get_usable_table_names()),
-                db_schema_pretty=db_schema_pretty,
-                formatted_templates=formatted_templates,
+                usable_tables=list(usable_tables),
+                db_schema_pretty=trimmed_db_schema(frozenset(usable_tables)),
+                formatted_templates=self.chatbot_sql_templates_text,
             )
 
-            prompt = build_sql_generation_prompt(state["question"])
-
             # Use OpenRouter with Claude for superior SQL generation
             try:
                 # Claude 3.5 Sonnet is excellent for SQL - use it as primary choice
                 response_obj = self.openrouter_service.generate_text(
-                    prompt=prompt,
                     model="anthropic/claude-sonnet-4",  # Claude excels at structured reasoning and SQL
                     temperature=0.05,  # Very low temperature for precise, deterministic SQL
-                    system_message=system_message,
                     usage_log=state.get("usage_log"),
-                    response_format=SQL_QUERY_RESPONSE_SCHEMA,
+                    response_format=SQL_QUERY_RESPONSE_SCHEMA_JSON,
+                    messages=messages,
+                    cache=True,
                 )
                 parsed_response = self._parse_sql_query_response(response_obj.content)
                 logger.info(f"SQL generated using Claude 3.5 Sonnet")
@@ -144,12 +260,12 @@ class SQLQueryAgentService:
                 logger.warning(f"Claude failed, falling back to GPT-4o: {claude_error}")
                 # Fallback to GPT-4o for SQL generation
                 response_obj = self.openrouter_service.generate_text(
-                    prompt=prompt,
                     model=OPENROUTER_GPT_4O,  # Use full GPT-4o for better SQL reasoning
                     temperature=0.1,
-                    system_message=system_message,
                     usage_log=state.get("usage_log"),
-                    response_format=SQL_QUERY_RESPONSE_SCHEMA,
+                    response_format=SQL_QUERY_RESPONSE_SCHEMA_JSON,
+                    messages=messages,
+                    cache=True,
                 )
                 parsed_response = self._parse_sql_query_response(response_obj.content)
 
@@ -161,29 +277,20 @@ class SQLQueryAgentService:
                 query = query.replace("```", "").strip()
 
             # Clean up the query
-            query = query.split(";")[0]  # Remove semicolon and anything after
+            query = query.partition(";")[0]  # Remove semicolon and anything after
             query = query.strip()
 
             logger.info(f"Generated SQL query: {query}")
 
-            # Basic validation - let LLM handle the complex logic
-            query_lower = query.lower()
-
-            # Simple check: if no account_id filtering is present anywhere in the query, flag it
-            if "account_id" not in query_lower:
-                logger.warning(
-                    f"Query appears to be missing account_id filtering: {query}"
-                )
-                # Log for monitoring, but don't modify - trust the LLM's decision
+            # Hesap izolasyonu: yanlış/eksik account_id filtresi olan sorgu çalıştırılmaz
+            _check_account_scope(query, state["account_id"])
 
             state["query"] = query
 
         except Exception as e:
             logger.error(f"Error in write_query: {str(e)}")
             # Fallback to simple query
-            state["query"] = (
-                f"SELECT 'Error generating query: {str(e)}' as error_message"
-            )
+            state["query"] = f"{_QUERY_ERROR_PREFIX}: {str(e)}' as error_message"
 
     def execute_query(self, state: State):
         """Execute SQL query."""
@@ -300,105 +407,52 @@ class SQLQueryAgentService:
 
     def refine_answer(self, state: State):
         """
-        Refine the answer by replacing category codes with their proper names.
-        This is especially useful for category codes that should be translated to human-readable names.
+        Fetch category translations when the answer mentions categories, then
+        run the fused verification step which also applies them.
         """
-        answer = state["answer"]
-        result = state["result"]
+        category_translations = None
 
         # Check if the answer contains category codes that might need translation
         if any(
-            code_indicator in answer.lower()
+            code_indicator in state["answer"].lower()
             for code_indicator in ["kategori", "category"]
         ):
-            # Create a query to check if we need to translate any category codes
-            category_check_obj = self.openrouter_service.generate_text(
-                prompt=build_category_check_prompt(answer, result),
-                model=OPENROUTER_GPT_4O_MINI,
-                temperature=0.1,
-                usage_log=state.get("usage_log"),
-            )
-            category_check_response_content = category_check_obj.content
-
-            # If the model identifies codes that need translation
-            if "yes" in category_check_response_content.lower():
-                # Query the database to get the proper category names
-                try:
-                    # Create a query to get category translations
-                    translation_query = """
-                    SELECT key, title_tr, title_en 
-                    FROM incident_report_categories
-                    """
-
-                    # Execute the query
-                    execute_query_tool = QuerySQLDatabaseTool(db=self.db)
-                    category_translations = execute_query_tool.invoke(translation_query)
-
-                    # Create a prompt to refine the answer with proper category names
-                    refined_obj = self.openrouter_service.generate_text(
-                        prompt=build_category_refine_prompt(
-                            answer=answer,
-                            translations=category_translations,
-                        ),
-                        model=OPENROUTER_GPT_4O_MINI,
-                        temperature=0.2,
-                        usage_log=state.get("usage_log"),
-                    )
-                    state["answer"] = refined_obj.content
-
-                except Exception as e:
-                    logger.error(
-                        f"Error refining answer with category translations: {str(e)}"
-                    )
-                    # Keep the original answer if refinement fails
-                    pass
-
-        # After refining, verify and improve the answer if needed
-        self.verify_and_improve_answer(state)
-
-    def verify_and_improve_answer(self, state: State):
+            try:
+                translation_query = """
+                SELECT key, title_tr, title_en 
+                FROM incident_report_categories
+                """
+                execute_query_tool = QuerySQLDatabaseTool(db=self.db)
+                category_translations = execute_query_tool.invoke(translation_query)
+            except Exception as e:
+                logger.error(f"Error fetching category translations: {str(e)}")
+
+        self.verify_and_improve_answer(state, category_translations)
+
+    def verify_and_improve_answer(
+        self, state: State, category_translations: Optional[str] = None
+    ):
         """
-        Verify if the answer is satisfactory and try to improve it if needed.
-        This is a second-pass check to ensure high-quality responses.
+        Verify the answer and improve it if needed in a single structured LLM
+        call; category translations, when given, are applied in the same pass.
         """
-        answer = state["answer"]
-        question = state["question"]
-        result = state["result"]
-        query = state["query"]
-
         try:
-            verification_obj = self.openrouter_service.generate_text(
+            review_obj = self.openrouter_service.generate_text(
                 prompt=build_answer_verification_prompt(
-                    question=question,
-                    query=query,
-                    result=result,
-                    answer=answer,
+                    question=state["question"],
+                    query=state["query"],
+                    result=state["result"],
+                    answer=state["answer"],
+                    category_translations=category_translations,
                 ),
                 model=OPENROUTER_GPT_4O_MINI,
-                temperature=0.1,
+                temperature=0.2,
                 usage_log=state.get("usage_log"),
+                response_format=ANSWER_REVIEW_RESPONSE_SCHEMA_JSON,
             )
-            verification_response_content = verification_obj.content
-
-            # Check if the answer needs improvement
-            if any(
-                indicator in verification_response_content.lower()
-                for indicator in ["below 8", "improve", "should be", "could be better"]
-            ):
-                # Create an improvement prompt
-                improved_obj = self.openrouter_service.generate_text(
-                    prompt=build_answer_improvement_prompt(
-                        question=question,
-                        query=query,
-                        result=result,
-                        answer=answer,
-                        evaluation=verification_response_content,
-                    ),
-                    model=OPENROUTER_GPT_4O_MINI,
-                    temperature=0.3,
-                    usage_log=state.get("usage_log"),
-                )
-                state["answer"] = improved_obj.content
+            review = AnswerReviewResponse.model_validate_json(review_obj.content)
+            if review.improved and review.final_answer.strip():
+                state["answer"] = review.final_answer
 
         except Exception as e:
             logger.error(f"Error verifying and improving answer: {str(e)}")
@@ -417,17 +471,53 @@ class SQLQueryAgentService:
             logger.warning("SQL query response parse failed: %s", exc)
             return SQLQueryResponse(sql_query=payload, reasoning=None)
 
-    async def chat_with_database(
+    def _lookup_cached_answer(
+        self, cache_key: Tuple, state: State
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Saklanan SQL'i yeniden çalıştırır. Sonuç özeti tutuyorsa saklanan cevabı,
+        her durumda yeni sonuç özetini döndürür (kayıt yoksa ikisi de None).
+        """
+        with self._answer_cache_lock:
+            cached = self._answer_cache.get(cache_key)
+        if cached is None:
+            return None, None
+
+        cached_query, cached_digest, cached_answer = cached
+        state["query"] = cached_query
+        self.execute_query(state)
+        result_digest = _result_digest(state["result"])
+        if result_digest == cached_digest:
+            logger.info("SQL answer cache hit for account %s", state["account_id"])
+            return cached_answer, result_digest
+        return None, result_digest
+
+    def _store_answer(
+        self, cache_key: Tuple, state: State, result_digest: str, answer: str
+    ) -> None:
+        if str(state["result"]).startswith("Error") or state["query"].startswith(
+            _QUERY_ERROR_PREFIX
+        ):
+            return
+        with self._answer_cache_lock:
+            self._answer_cache[cache_key] = (state["query"], result_digest, answer)
+
+    def _run_database_chat(
         self, question: str, account_id: int
     ) -> Tuple[str, ChatbotUsageLog]:
-        """Process database queries and track token usage."""
-        try:
-            usage_log = ChatbotUsageLog()
-            state = State(question=question)
+        """`chat_with_database` için bloklayan SQL agent adımlarını çalıştırır."""
+        usage_log = ChatbotUsageLog()
+        state = State(question=question)
+
+        state["usage_log"] = usage_log
+        state["account_id"] = account_id  # Add account_id to state
 
-            state["usage_log"] = usage_log
-            state["account_id"] = account_id  # Add account_id to state
+        cache_key = ("basic", account_id, _normalize_question(question))
+        cached_answer, result_digest = self._lookup_cached_answer(cache_key, state)
+        if cached_answer is not None:
+            return cached_answer, usage_log
 
+        if result_digest is None:
             # Execute write_query (usage tracking handled internally in OpenRouter calls)
             self.write_query(state)
 
@@ -436,11 +526,27 @@ class SQLQueryAgentService:
             )
             # Execute query doesn't use LLM
             self.execute_query(state)
+            result_digest = _result_digest(state["result"])
 
-            # Execute answer generation (usage tracking handled internally in OpenRouter calls)
-            self.generate_answer(state, account_id)
+        # Execute answer generation (usage tracking handled internally in OpenRouter calls)
+        self.generate_answer(state, account_id)
+        self._store_answer(cache_key, state, result_digest, state["answer"])
 
-            return state["answer"], usage_log
+        return state["answer"], usage_log
+
+    async def chat_with_database(
+        self, question: str, account_id: int
+    ) -> Tuple[str, ChatbotUsageLog]:
+        """Process database queries and track token usage."""
+        try:
+            await self._ensure_chatbot_sql_templates()
+
+            # The agent steps are synchronous (LLM + DB round-trips), so run
+            # them on the bounded pool instead of the event loop
+            return await asyncio.get_running_loop().run_in_executor(
+                _SQL_AGENT_EXECUTOR,
+                functools.partial(self._run_database_chat, question, account_id),
+            )
 
         except Exception as e:
             error_msg = f"SQL agent hatası: {str(e)}"
@@ -448,6 +554,76 @@ class SQLQueryAgentService:
             error_log = ChatbotUsageLog.create_error_log(error_msg)
             raise Exception(error_msg)
 
+    def _run_advanced_database_chat(
+        self,
+        question: str,
+        account_id: int,
+        model: str,
+        temperature: float,
+    ) -> Tuple[str, ChatbotUsageLog]:
+        """`advanced_database_chat` için bloklayan SQL agent adımlarını çalıştırır."""
+        usage_log = ChatbotUsageLog()
+        state = State(question=question)
+
+        state["usage_log"] = usage_log
+        state["account_id"] = account_id
+
+        # Cevap modele ve sıcaklığa bağlı olduğundan ikisi de anahtarda
+        cache_key = (
+            "advanced",
+            account_id,
+            _normalize_question(question),
+            model,
+            temperature,
+        )
+        cached_answer, result_digest = self._lookup_cached_answer(cache_key, state)
+        if cached_answer is not None:
+            return cached_answer, usage_log
+
+        if result_digest is None:
+            # Execute SQL query generation and execution
+            self.write_query(state)
+            self.execute_query(state)
+            result_digest = _result_digest(state["result"])
+
+        # Enhanced answer generation with specified model
+        system_message = ADVANCED_SQL_SYSTEM_MESSAGE
+        prompt = build_advanced_sql_prompt(
+            question=state["question"],
+            query=state["query"],
+            result=state["result"],
+            account_id=account_id,
+        )
+
+        logger.info(
+            f"Advanced Database Chat - Model: {model}, Temperature: {temperature}"
+        )
+        # Use specified OpenRouter model
+        response_obj = self.openrouter_service.generate_text(
+            prompt=prompt,
+            model="google/gemini-2.5-flash",
+            temperature=temperature,
+            system_message=system_message,
+            usage_log=usage_log,
+        )
+
+        final_answer = response_obj.content
+
+        # Enhanced post-processing for advanced model
+        if "gpt-4o" in model.lower() or "claude" in model.lower():
+            # Add data visualization suggestions for advanced models
+            viz_obj = self.openrouter_service.generate_text(
+                prompt=build_visualization_prompt(state["result"]),
+                model=OPENROUTER_GPT_4O_MINI,
+                temperature=0.2,
+                usage_log=usage_log,
+            )
+
+            final_answer += f"\n\n📊 Görselleştirme Önerisi: {viz_obj.content}"
+
+        self._store_answer(cache_key, state, result_digest, final_answer)
+        return final_answer, usage_log
+
     async def advanced_database_chat(
         self,
         question: str,
@@ -468,54 +644,19 @@ class SQLQueryAgentService:
             Tuple containing (response content, ChatbotUsageLog)
         """
         try:
-
-            usage_log = ChatbotUsageLog()
-            state = State(question=question)
-
-            state["usage_log"] = usage_log
-            state["account_id"] = account_id
-
-            # Execute SQL query generation and execution
-            self.write_query(state)
-            self.execute_query(state)
-
-            # Enhanced answer generation with specified model
-            system_message = ADVANCED_SQL_SYSTEM_MESSAGE
-            prompt = build_advanced_sql_prompt(
-                question=state["question"],
-                query=state["query"],
-                result=state["result"],
-                account_id=account_id,
-            )
-
-            logger.info(
-                f"Advanced Database Chat - Model: {model}, Temperature: {temperature}"
-            )
-            # Use specified OpenRouter model
-            response_obj = self.openrouter_service.generate_text(
-                prompt=prompt,
-                model="google/gemini-2.5-flash",
-                temperature=temperature,
-                system_message=system_message,
-                usage_log=usage_log,
+            await self._ensure_chatbot_sql_templates()
+
+            return await asyncio.get_running_loop().run_in_executor(
+                _SQL_AGENT_EXECUTOR,
+                functools.partial(
+                    self._run_advanced_database_chat,
+                    question,
+                    account_id,
+                    model,
+                    temperature,
+                ),
             )
 
-            final_answer = response_obj.content
-
-            # Enhanced post-processing for advanced model
-            if "gpt-4o" in model.lower() or "claude" in model.lower():
-                # Add data visualization suggestions for advanced models
-                viz_obj = self.openrouter_service.generate_text(
-                    prompt=build_visualization_prompt(state["result"]),
-                    model=OPENROUTER_GPT_4O_MINI,
-                    temperature=0.2,
-                    usage_log=usage_log,
-                )
-
-                final_answer += f"\n\n📊 Görselleştirme Önerisi: {viz_obj.content}"
-
-            return final_answer, usage_log
-
         except Exception as e:
             error_msg = f"Advanced SQL agent error: {str(e)}"
             logger.error(error_msg)
@@ -2,6 +2,7 @@ import os
 import magic
 from datetime import datetime, timedelta, timezone
 import re
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,6 +10,10 @@ load_dotenv()
 def get_current_time_utc3():
     return datetime.now(timezone.utc).astimezone(timezone(timedelta(hours=3)))
 
+def format_utc_timestamp(ts: float) -> str:
+    """Epoch seconds -> naive UTC ISO-8601 string with microseconds, without building a datetime."""
+    return f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(ts))}.{int((ts % 1) * 1e6):06d}"
+
 def replaceName(text):
         if text is None:
             return None
@@ -58,7 +58,7 @@ class AWSTextractHandler:
 
     def _get_file_extension(self, file_path: str) -> str:
         """Get file extension from the file path."""
-        return file_path.split('.')[-1].lower()
+        return file_path.rpartition('.')[2].lower()
 
     def _is_supported_format(self, file_extension: str) -> bool:
         """Check if the file format is supported."""
@@ -258,7 +258,7 @@ class AWSTextractHandler:
             file_content = self._download_from_url(document_url)
             
             # Generate a unique filename
-            file_name = f"temp/{int(time.time())}_{document_url.split('/')[-1]}"
+            file_name = f"temp/{int(time.time())}_{document_url.rpartition('/')[2]}"
             
             # Upload to S3
             s3_key = self._upload_to_s3(file_content, file_name)
@@ -1,5 +1,8 @@
+import asyncio
+import hashlib
 import os
 from typing import List, Optional, Dict, Any
+from cachetools import LRUCache
 from langchain_pinecone import Pinecone
 from langchain_openai import OpenAIEmbeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
@@ -13,6 +16,11 @@ from uuid import uuid4
 logger = logging.getLogger(__name__)
 
 class VectorStoreHandler:
+    # Query embeddings shared across handler instances (services are built per
+    # request); vectors are kept as float tuples so a hit returns exactly what
+    # a fresh embedding would
+    _query_embedding_cache: LRUCache = LRUCache(maxsize=10_000)
+
     def __init__(self):
         """Initialize the Vector Store Service with Pinecone"""
         self.pinecone_api_key = get_env("PINECONE_API_KEY")
@@ -115,6 +123,25 @@ class VectorStoreHandler:
             logger.error(f"Error adding texts to vector store: {e}")
             raise
 
+    async def embed_query(self, query: str) -> List[float]:
+        """
+        Embed a search query, reusing the cached vector for repeated questions
+
+        Args:
+            query (str): Query text to embed
+
+        Returns:
+            List[float]: Query embedding
+        """
+        key = hashlib.blake2b(query.encode("utf-8"), digest_size=16).digest()
+        cached = self._query_embedding_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        vector = await asyncio.to_thread(self.embeddings.embed_query, query)
+        self._query_embedding_cache[key] = tuple(vector)
+        return vector
+
     async def similarity_search(
         self,
         query: str,
@@ -143,12 +170,16 @@ class VectorStoreHandler:
             if additional_filter:
                 filter_dict.update(additional_filter)
             
-            results = vector_store.similarity_search(
-                query=query,
+            query_vector = await self.embed_query(query)
+
+            # The Pinecone query is a blocking HTTP call; keep it off the event loop
+            results = await asyncio.to_thread(
+                vector_store.similarity_search_by_vector_with_score,
+                embedding=query_vector,
                 k=k,
                 filter=filter_dict
             )
-            return results
+            return [doc for doc, _ in results]
         
         except Exception as e:
             logger.error(f"Error performing similarity search: {e}")